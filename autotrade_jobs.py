@@ -10,6 +10,8 @@ import modules.db_access as autotrade_db
 
 logger = logging.getLogger(__name__)
 
+GEMINI_MAX_CONCURRENT_REQUESTS = 4
+
 async def get_trade_suggestions_from_gemini(symbols):
     if not config.GEMINI_API_KEY:
         logger.warning("GEMINI_API_KEY not found. Cannot get trade suggestions.")
@@ -17,15 +19,23 @@ async def get_trade_suggestions_from_gemini(symbols):
 
     model = genai.GenerativeModel('gemini-1.5-flash')
     suggestions = {}
+    # Symbols are analysed concurrently: run_blocking paces the Binance requests, and this
+    # bounds the Gemini calls in flight in place of the old one-second stagger
+    gemini_slots = asyncio.Semaphore(GEMINI_MAX_CONCURRENT_REQUESTS)
 
-    for symbol in symbols:
+    async def suggest(symbol):
         try:
-            rsi = trade.get_rsi(symbol)
-            upper_band, sma, lower_band, bb_std = trade.get_bollinger_bands(symbol)
-            macd, macd_signal, macd_hist = trade.get_macd(symbol)
-            micro_vwap = trade.get_micro_vwap(symbol)
-            volume_ratio = trade.get_bid_ask_volume_ratio(symbol)
-            mad = trade.get_mad(symbol)
+            # The blocking indicator fetches run in worker threads, concurrently
+            rsi, bands, macd_values, micro_vwap, volume_ratio, mad = await asyncio.gather(
+                trade.run_blocking(trade.get_rsi, symbol),
+                trade.run_blocking(trade.get_bollinger_bands, symbol),
+                trade.run_blocking(trade.get_macd, symbol),
+                trade.run_blocking(trade.get_micro_vwap, symbol),
+                trade.run_blocking(trade.get_bid_ask_volume_ratio, symbol),
+                trade.run_blocking(trade.get_mad, symbol),
+            )
+            upper_band, sma, lower_band, bb_std = bands
+            macd, macd_signal, macd_hist = macd_values
 
             prompt = (
                 f"Analyze the current market for {symbol} using these metrics:\n"
@@ -37,15 +47,17 @@ async def get_trade_suggestions_from_gemini(symbols):
                 f"MAD: {mad}\n"
                 "Should I buy now for a small gain? Answer with only 'buy' or 'hold'."
             )
-            response = await model.generate_content_async(prompt)
+            async with gemini_slots:
+                response = await model.generate_content_async(prompt)
             decision = response.text.strip().lower()
             if decision in ['buy', 'hold']:
                 suggestions[symbol] = decision
         except Exception as e:
             logger.error(f"Error getting Gemini suggestion for {symbol}: {e}")
-        await asyncio.sleep(1)  # Add a 1-second delay between requests
 
-    return suggestions
+    await asyncio.gather(*(suggest(symbol) for symbol in symbols))
+    # Keep the configured coin order for the buys that follow
+    return {symbol: suggestions[symbol] for symbol in symbols if symbol in suggestions}
 
 async def autotrade_cycle(context: ContextTypes.DEFAULT_TYPE):
     logger.info("Starting autotrade cycle...")
@@ -61,13 +73,13 @@ async def autotrade_cycle(context: ContextTypes.DEFAULT_TYPE):
     for symbol, decision in suggestions.items():
         if decision == 'buy':
             try:
-                usdt_balance = trade.get_account_balance(user_id, 'USDT')
+                usdt_balance = await trade.run_blocking(trade.get_account_balance, user_id, 'USDT')
                 if usdt_balance is None or usdt_balance < 10:
                     logger.warning(f"Insufficient balance to autotrade {symbol}.")
                     continue
 
                 trade_size = usdt_balance * 0.1  # Use 10% of balance for each trade
-                order, entry_price, quantity = trade.place_buy_order(user_id, symbol, trade_size)
+                order, entry_price, quantity = await trade.run_blocking(trade.place_buy_order, user_id, symbol, trade_size)
 
                 slip_manager.create_and_store_slip(symbol, 'buy', quantity, entry_price)
 
@@ -81,18 +93,20 @@ async def autotrade_cycle(context: ContextTypes.DEFAULT_TYPE):
 async def monitor_autotrades(context: ContextTypes.DEFAULT_TYPE):
     logger.info("Monitoring open autotrades...")
     encrypted_slips = slip_manager.redis_client.keys('*')
+    # One ticker snapshot prices every slip instead of a request per slip
+    prices = (await trade.run_blocking(trade.get_all_prices) or {}) if encrypted_slips else {}
 
     for encrypted_slip in encrypted_slips:
         try:
             slip = slip_manager.get_and_decrypt_slip(encrypted_slip)
-            current_price = trade.get_current_price(slip['symbol'])
+            current_price = prices.get(slip['symbol']) or await trade.aget_current_price(slip['symbol'])
             if not current_price:
                 continue
 
             pnl_percent = ((current_price - slip['price']) / slip['price']) * 100
 
             if pnl_percent >= autotrade_db.get_user_effective_settings(config.ADMIN_USER_ID)['PROFIT_TARGET_PERCENTAGE']:
-                trade.place_sell_order(config.ADMIN_USER_ID, slip['symbol'], slip['amount'])
+                await trade.run_blocking(trade.place_sell_order, config.ADMIN_USER_ID, slip['symbol'], slip['amount'])
                 slip_manager.delete_slip(encrypted_slip)
 
                 await context.bot.send_message(
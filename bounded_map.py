@@ -0,0 +1,78 @@
+import threading
+
+class ShadowMap:
+    """
+    Size-bounded map with approximate LRU eviction (the hashlru two-generation scheme).
+    New keys go into `main`; once it holds `max_size` keys it becomes the `shadow`
+    generation and a fresh `main` starts, dropping the previous shadow wholesale.
+    Reading a key from the shadow promotes it back into `main`, so entries in use
+    survive. Every operation is O(1) and at most 2 * max_size keys are held.
+    Safe to share between the event loop and worker threads: every operation takes an
+    internal lock, and items() returns a snapshot rather than iterating the live dicts.
+    The lock covers the map only; callers guard mutable values stored in it themselves.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._main = {}
+        self._shadow = {}
+        self._lock = threading.Lock()
+
+    def _store(self, key, value):
+        self._main[key] = value
+        if len(self._main) >= self.max_size:
+            self._shadow = self._main
+            self._main = {}
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._main:
+                return self._main[key]
+            if key in self._shadow:
+                value = self._shadow.pop(key)
+                self._store(key, value)
+                return value
+            return default
+
+    def setdefault(self, key, default):
+        """Returns the value for `key`, first storing `default` if it is missing, in one step."""
+        with self._lock:
+            if key in self._main:
+                return self._main[key]
+            value = self._shadow.pop(key, default)
+            self._store(key, value)
+            return value
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._shadow.pop(key, None)
+            if key in self._main:
+                self._main[key] = value
+            else:
+                self._store(key, value)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._main or key in self._shadow
+
+    def __len__(self):
+        with self._lock:
+            return len(self._main) + len(self._shadow)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key in self._main:
+                return self._main.pop(key)
+            return self._shadow.pop(key, default)
+
+    def items(self):
+        with self._lock:
+            return [*self._shadow.items(), *self._main.items()]
+
+_MISSING = object()
@@ -107,6 +107,24 @@ SUBSCRIPTION_TIERS = {
     }
 }
 
+def with_exit_multipliers(settings: dict) -> dict:
+    """
+    Validates the stop-loss/take-profit percentages and stores the price multipliers
+    derived from them, so call sites do a single multiply.
+    """
+    stop_loss = float(settings['STOP_LOSS_PERCENTAGE'])
+    profit_target = float(settings['PROFIT_TARGET_PERCENTAGE'])
+    if not 0 < stop_loss < 100:
+        raise ValueError(f"STOP_LOSS_PERCENTAGE must be between 0 and 100, got {stop_loss}")
+    if profit_target <= 0:
+        raise ValueError(f"PROFIT_TARGET_PERCENTAGE must be positive, got {profit_target}")
+    settings['SL_MULT'] = 1.0 - stop_loss / 100.0
+    settings['TP_MULT'] = 1.0 + profit_target / 100.0
+    return settings
+
+for _tier_settings in SUBSCRIPTION_TIERS.values():
+    with_exit_multipliers(_tier_settings)
+
 # --- Helper function to get current settings ---
 # This will be crucial for the rest of the code to adapt to the tier system.
 def get_active_settings(tier: str):
@@ -15,6 +15,9 @@ def get_db_connection():
     if _conn is None:
         _conn = sqlite3.connect(DB_NAME, check_same_thread=False)
         _conn.row_factory = sqlite3.Row  # Always return rows as dict-like objects
+        # Same file and settings as modules.db_access, so this connection doesn't fsync every commit
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
     return _conn
 
 def close_db_connection():
@@ -1,9 +1,242 @@
+from functools import lru_cache
+
 import numpy as np
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; the kernels run as plain Python without it
+    NUMBA_AVAILABLE = False
+    prange = range
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+def kline_column(klines, index):
+    """One numeric kline field (e.g. 4 for close) as float64; NumPy parses Binance's price strings."""
+    return np.fromiter((k[index] for k in klines), dtype=np.float64, count=len(klines))
+
 def calc_atr(klines, period=14):
-    highs = np.array([float(k[2]) for k in klines])
-    lows = np.array([float(k[3]) for k in klines])
-    closes = np.array([float(k[4]) for k in klines])
-    trs = np.maximum(highs[1:] - lows[1:], np.abs(highs[1:] - closes[:-1]), np.abs(lows[1:] - closes[:-1]))
+    # Only the last `period` true ranges are averaged, and each needs the close before it
+    klines = klines[-(period + 1):]
+    highs = kline_column(klines, 2)
+    lows = kline_column(klines, 3)
+    closes = kline_column(klines, 4)
+    trs = np.maximum(highs[1:] - lows[1:], np.maximum(np.abs(highs[1:] - closes[:-1]), np.abs(lows[1:] - closes[:-1])))
     atr = np.mean(trs[-period:])
     return atr
+
+def calc_rsi(closes, period=14):
+    """Wilder-smoothed RSI of the last value in `closes` (needs at least period + 1 closes)."""
+    return rsi_from_averages(*wilder_averages(closes, period))
+
+def wilder_averages(closes, period=14):
+    """Returns Wilder's (avg_gain, avg_loss) after smoothing over every delta in `closes`."""
+    if NUMBA_AVAILABLE:
+        return _wilder_loop(np.asarray(closes, dtype=np.float64), period)
+    deltas = np.diff(closes)
+    weights = _wilder_weights(deltas.size, period)
+    avg_gain = float(weights @ np.maximum(deltas, 0.0))
+    # losses = gains - deltas, so their weighted sum needs no second masked array
+    avg_loss = max(avg_gain - float(weights @ deltas), 0.0)
+    return avg_gain, avg_loss
+
+@njit(cache=True)
+def _wilder_loop(closes, period):
+    # One pass over ~100 closes beats the diff/maximum/dot dispatches of the NumPy form
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, period + 1):
+        delta = closes[i] - closes[i - 1]
+        if delta > 0:
+            gain += delta
+        else:
+            loss -= delta
+    gain /= period
+    loss /= period
+    # Multiplying by precomputed factors keeps the two divisions out of the recurrence
+    decay = (period - 1) / period
+    weight = 1.0 / period
+    for i in range(period + 1, closes.size):
+        delta = closes[i] - closes[i - 1]
+        gain = gain * decay + max(delta, 0.0) * weight
+        loss = loss * decay + max(-delta, 0.0) * weight
+    return gain, loss
+
+def wilder_step(avg_gain, avg_loss, delta, period=14):
+    """Folds one more close-to-close delta into Wilder's averages."""
+    avg_gain = (avg_gain * (period - 1) + max(delta, 0.0)) / period
+    avg_loss = (avg_loss * (period - 1) + max(-delta, 0.0)) / period
+    return avg_gain, avg_loss
+
+def rsi_from_averages(avg_gain, avg_loss):
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+@lru_cache(maxsize=32)
+def _wilder_weights(n, period):
+    """
+    Closed-form weights of Wilder's smoothing over n deltas: the simple-average seed of
+    the first `period` deltas followed by avg = ((period - 1) * avg + x) / period, unrolled.
+    """
+    alpha = 1.0 / period
+    m = n - period  # smoothing steps after the seed window
+    weights = np.empty(n)
+    weights[:period] = (1.0 - alpha) ** m / period
+    weights[period:] = alpha * (1.0 - alpha) ** np.arange(m - 1, -1, -1)
+    weights.setflags(write=False)
+    return weights
+
+def calc_bollinger(closes, period=20, std_dev=2):
+    """(upper, sma, lower, std) over the last `period` closes."""
+    if NUMBA_AVAILABLE:
+        return _bollinger_last(np.asarray(closes, dtype=np.float64), period, float(std_dev))
+    # One pass for the sum and one dot for the sum of squares, instead of np.std's mean-then-deviations
+    shift = closes[-1]
+    window = closes[-period:] - shift
+    return bollinger_from_sums(window.sum(), np.dot(window, window), period, std_dev, shift)
+
+@njit(cache=True)
+def _bollinger_last(closes, period, std_dev):
+    # Same shifted sums as the NumPy form, accumulated in a single loop
+    n = closes.size
+    shift = closes[n - 1]
+    total = 0.0
+    total_sq = 0.0
+    for i in range(n - period, n):
+        x = closes[i] - shift
+        total += x
+        total_sq += x * x
+    mean = total / period
+    std = np.sqrt(max(total_sq / period - mean * mean, 0.0))
+    sma = mean + shift
+    return sma + std * std_dev, sma, sma - std * std_dev, std
+
+def bollinger_from_sums(total, total_sq, n, std_dev=2, shift=0.0):
+    """
+    (upper, sma, lower, std) from a window's running sum and sum of squares. Values are
+    taken relative to `shift` (any recent price) so the variance doesn't cancel catastrophically.
+    """
+    mean = total / n
+    std = np.sqrt(max(total_sq / n - mean * mean, 0.0))
+    sma = mean + shift
+    return sma + std * std_dev, sma, sma - std * std_dev, std
+
+def calc_macd(closes, fast_period=12, slow_period=26, signal_period=9):
+    """Latest (macd, signal, histogram), matching pandas ewm(span=..., adjust=False)."""
+    if (fast_period, slow_period, signal_period) == (12, 26, 9):
+        return macd_12_26_9(closes)
+    return _macd_last(closes, 2.0 / (fast_period + 1.0), 2.0 / (slow_period + 1.0), 2.0 / (signal_period + 1.0))
+
+@njit(cache=True, fastmath=True)
+def _macd_last(closes, fast_alpha, slow_alpha, signal_alpha):
+    # Fast EMA, slow EMA and the signal EMA of their difference in one pass, without intermediate arrays
+    fast = closes[0]
+    slow = closes[0]
+    signal = 0.0
+    for i in range(1, closes.shape[0]):
+        fast = fast_alpha * closes[i] + (1.0 - fast_alpha) * fast
+        slow = slow_alpha * closes[i] + (1.0 - slow_alpha) * slow
+        signal = signal_alpha * (fast - slow) + (1.0 - signal_alpha) * signal
+    macd = fast - slow
+    return macd, signal, macd - signal
+
+def _specialize_macd(fast_period, slow_period, signal_period):
+    """_macd_last compiled for fixed periods; numba folds the closed-over alphas in as constants."""
+    fast_alpha = 2.0 / (fast_period + 1.0)
+    slow_alpha = 2.0 / (slow_period + 1.0)
+    signal_alpha = 2.0 / (signal_period + 1.0)
+
+    @njit(fastmath=True)
+    def macd_last(closes):
+        fast = closes[0]
+        slow = closes[0]
+        signal = 0.0
+        for i in range(1, closes.shape[0]):
+            fast = fast_alpha * closes[i] + (1.0 - fast_alpha) * fast
+            slow = slow_alpha * closes[i] + (1.0 - slow_alpha) * slow
+            signal = signal_alpha * (fast - slow) + (1.0 - signal_alpha) * signal
+        macd = fast - slow
+        return macd, signal, macd - signal
+    return macd_last
+
+# The bot only ever asks for the standard MACD
+macd_12_26_9 = _specialize_macd(12, 26, 9)
+
+def batch_indicators(closes, rsi_period=14, bb_period=20, std_dev=2, fast_period=12, slow_period=26, signal_period=9):
+    """
+    RSI, Bollinger Bands and MACD for many symbols at once. `closes` is a 2D array with
+    one row of closes per symbol (all the same length); returns a (7, rows) array of
+    rsi, upper, sma, lower, std, macd and signal, each matching the single-symbol functions.
+    """
+    closes = np.ascontiguousarray(closes, dtype=np.float64)
+    return _batch_indicators(closes, rsi_period, bb_period, float(std_dev),
+                             2.0 / (fast_period + 1.0), 2.0 / (slow_period + 1.0), 2.0 / (signal_period + 1.0))
+
+@njit(cache=True, parallel=True)
+def _batch_indicators(closes, rsi_period, bb_period, std_dev, fast_alpha, slow_alpha, signal_alpha):
+    # Rows are independent, so prange spreads symbols across cores
+    n_rows, n = closes.shape
+    out = np.empty((7, n_rows))
+    for r in prange(n_rows):
+        row = closes[r]
+
+        # Wilder RSI and Bollinger Bands share the single-symbol kernels
+        gain, loss = _wilder_loop(row, rsi_period)
+        if loss == 0:
+            out[0, r] = 100.0 if gain > 0 else 50.0
+        else:
+            out[0, r] = 100.0 - 100.0 / (1.0 + gain / loss)
+        out[1, r], out[2, r], out[3, r], out[4, r] = _bollinger_last(row, bb_period, std_dev)
+
+        # MACD, as in _macd_last
+        fast = row[0]
+        slow = row[0]
+        signal = 0.0
+        for i in range(1, n):
+            fast = fast_alpha * row[i] + (1.0 - fast_alpha) * fast
+            slow = slow_alpha * row[i] + (1.0 - slow_alpha) * slow
+            signal = signal_alpha * (fast - slow) + (1.0 - signal_alpha) * signal
+        out[5, r] = fast - slow
+        out[6, r] = signal
+    return out
+
+def scan_trades(buy, sl, tp, cur, near_sl_pct, near_tp_pct):
+    """
+    Per-trade P/L % and near-stop-loss / near-take-profit masks over column arrays.
+    NaN prices or levels never match a mask.
+    """
+    if NUMBA_AVAILABLE:
+        return _scan_trades(buy, sl, tp, cur, near_sl_pct, near_tp_pct)
+    # Without numba the whole-array NumPy form beats an interpreted loop
+    pnl = (cur - buy) / buy * 100.0
+    near_sl = (cur > sl) & (cur <= sl * (1 + near_sl_pct / 100))
+    near_tp = cur >= tp * (1 - near_tp_pct / 100)
+    return pnl, near_sl, near_tp
+
+@njit(cache=True)
+def _scan_trades(buy, sl, tp, cur, near_sl_pct, near_tp_pct):
+    # No fastmath here: it would let LLVM assume the NaN comparisons away
+    n = buy.size
+    pnl = np.empty(n)
+    near_sl = np.zeros(n, dtype=np.bool_)
+    near_tp = np.zeros(n, dtype=np.bool_)
+    sl_factor = 1.0 + near_sl_pct / 100.0
+    tp_factor = 1.0 - near_tp_pct / 100.0
+    for i in range(n):
+        pnl[i] = (cur[i] - buy[i]) / buy[i] * 100.0
+        near_sl[i] = cur[i] > sl[i] and cur[i] <= sl[i] * sl_factor
+        near_tp[i] = cur[i] >= tp[i] * tp_factor
+    return pnl, near_sl, near_tp
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from numba's on-disk cache) at import instead of on the first monitor tick
+    _warmup = np.array([1.0, 2.0, 1.5])
+    _macd_last(_warmup, 0.5, 0.5, 0.5)
+    _wilder_loop(_warmup, 1)
+    _bollinger_last(_warmup, 2, 2.0)
+    macd_12_26_9(_warmup)
+    batch_indicators(np.arange(1.0, 41.0).reshape(1, 40))
+    _scan_trades(_warmup, _warmup, _warmup, _warmup, 1.0, 1.0)
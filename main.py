@@ -23,6 +23,12 @@ import autotrade_db
 logger = logging.getLogger(__name__)
 
 import asyncio
+import time
+import numpy as np
+try:
+    import uvloop  # optional: libuv-based event loop with cheaper socket I/O than the default one
+except ImportError:
+    uvloop = None
 
 # --- Gemini AI Model Initialization ---\nmodel = None
 gemini_api_key = os.getenv("GEMINI_API_KEY")
@@ -83,7 +89,7 @@ async def quest_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         if not symbol:
             await update.message.reply_text("Please specify a symbol. Usage: /quest SYMBOL", parse_mode='Markdown')
             return
-        rsi = trade.get_rsi(symbol)
+        rsi = await trade.aget_rsi(symbol)
         if rsi is None:
             await update.message.reply_text(f"Could not fetch RSI for {symbol}.")
             return
@@ -105,34 +111,31 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.message.reply_text("You have no open quests or watched symbols. Use /quest to find an opportunity.")
         return
 
-    message = ""
-
-    # --- Get all prices from the job's cache ---
-    prices = {}
-    cached_prices_data = context.bot_data.get('all_prices', {})
-    if cached_prices_data:
-        cache_timestamp = cached_prices_data.get('timestamp')
-        # Cache is valid if it's less than 125 seconds old (job runs every 60s)
-        if cache_timestamp and (datetime.now(timezone.utc) - cache_timestamp).total_seconds() < 125:
-            prices = cached_prices_data.get('prices', {})
-            logger.info(f"Using cached prices for /status for user {user_id}.")
-        else:
-            logger.warning(f"Price cache for user {user_id} is stale. Displaying last known data.")
+    # Parts are joined once at the end rather than re-copying the message on every append
+    parts = []
+
+    # --- Prices from the websocket price stream (one multi-symbol REST request if it is stale) ---
+    prices = await trade.run_blocking(trade.get_prices, sorted({t['coin_symbol'] for t in open_trades}))
 
     if open_trades:
-        message += "📜 **Your Open Quests:**\\n"
-        for trade_item in open_trades:
+        parts.append("📜 **Your Open Quests:**\\n")
+        # P/L for every quest in one array operation; quests without a price get NaN and are not shown
+        n = len(open_trades)
+        buy_prices = np.fromiter((t['buy_price'] for t in open_trades), dtype=np.float64, count=n)
+        current_prices = np.fromiter((prices.get(t['coin_symbol']) or np.nan for t in open_trades), dtype=np.float64, count=n)
+        pnl_percents = (current_prices - buy_prices) / buy_prices * 100.0
+        for i, trade_item in enumerate(open_trades):
             symbol = trade_item['coin_symbol']
             buy_price = trade_item['buy_price']
             current_price = prices.get(symbol)
             trade_id = trade_item['id']
 
-            message += f"\\n🔹 **{symbol}** (ID: {trade_id})"
+            parts.append(f"\\n🔹 **{symbol}** (ID: {trade_id})")
 
             if current_price:
-                pnl_percent = ((current_price - buy_price) / buy_price) * 100
+                pnl_percent = float(pnl_percents[i])
                 pnl_emoji = "📈" if pnl_percent >= 0 else "📉"
-                message += (
+                parts.append(
                     f"\\n   {pnl_emoji} P/L: `{pnl_percent:+.2f}%`"
                     f"\\n   Bought: `${buy_price:,.8f}`"
                     f"\\n   Current: `${current_price:,.8f}`"
@@ -140,27 +143,26 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 if user_tier == 'PREMIUM':
                     tp_price = trade_item['take_profit_price']
                     stop_loss = trade_item['stop_loss_price']
-                    message += (
+                    parts.append(
                         f"\\n   ✅ Target: `${tp_price:,.8f}`"
                         f"\\n   🛡️ Stop: `${stop_loss:,.8f}`"
                     )
             else:
-                message += "\\n   _(Price data is currently being updated)_"
+                parts.append("\\n   _(Price data is currently being updated)_")
 
-        message += "\\n"  # Add a newline for spacing before the watchlist
+        parts.append("\\n")  # Add a newline for spacing before the watchlist
 
     if watched_items:
-        message += "\\n🔭 **Your Watched Symbols:**\\n"
+        parts.append("\\n🔭 **Your Watched Symbols:**\\n")
+        now = time.time()
         for item in watched_items:
             # Calculate time since added
-            add_time = datetime.strptime(item['add_timestamp'], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
-            time_watching = datetime.now(timezone.utc) - add_time
-            hours, remainder = divmod(time_watching.total_seconds(), 3600)
+            hours, remainder = divmod(now - item['add_ts_epoch'], 3600)
             minutes, _ = divmod(remainder, 60)
-            message += f"\\n🔸 **{item['coin_symbol']}** (*Watching for {int(hours)}h {int(minutes)}m*)"
+            parts.append(f"\\n🔸 **{item['coin_symbol']}** (*Watching for {int(hours)}h {int(minutes)}m*)")
 
     # The send_premium_message wrapper is overly complex; a direct reply is cleaner.
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text("".join(parts), parse_mode='Markdown')
 
 async def resonate_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Runs Lunessa's quantum resonance simulation and sends the results."""
@@ -241,7 +243,7 @@ async def close_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
     # Now fetch the price for that specific symbol
     symbol = trade_to_close['coin_symbol']
-    current_price = trade.get_current_price(symbol)
+    current_price = await trade.aget_current_price(symbol)
     if current_price is None:
         await update.message.reply_text(f"Could not fetch the current price for {symbol} to close the trade. Please try again.")
         return
@@ -268,9 +270,9 @@ async def wallet_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     try:
         # Admin/creator/father bypasses API key check
         if is_admin:
-            balances = trade.get_all_spot_balances(config.ADMIN_USER_ID)
+            balances = await trade.run_blocking(trade.get_all_spot_balances, config.ADMIN_USER_ID)
         else:
-            balances = trade.get_all_spot_balances(user_id)
+            balances = await trade.run_blocking(trade.get_all_spot_balances, user_id)
         if balances is None:
             if is_admin:
                 await update.message.reply_text("Admin wallet retrieval failed. Please check Binance connectivity.", parse_mode='Markdown')
@@ -282,8 +284,7 @@ async def wallet_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             return
 
         # Fetch all prices at once for valuation
-        all_tickers = trade.client.get_all_tickers()
-        prices = {item['symbol']: float(item['price']) for item in all_tickers}
+        prices = await trade.run_blocking(trade.get_all_prices) or {}
 
         valued_assets = []
         total_usdt_value = 0.0
@@ -334,14 +335,13 @@ async def import_all_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     await update.message.reply_text("Scanning your Binance wallet to import all significant holdings as quests... 🔎 This may take a moment.")
 
     try:
-        balances = trade.get_all_spot_balances(user_id)
+        balances = await trade.run_blocking(trade.get_all_spot_balances, user_id)
         if not balances:
             await update.message.reply_text("Your spot wallet appears to be empty. Nothing to import.")
             return
 
         # Fetch all prices at once
-        all_tickers = trade.client.get_all_tickers()
-        prices = {item['symbol']: float(item['price']) for item in all_tickers}
+        prices = await trade.run_blocking(trade.get_all_prices) or {}
 
         imported_count = 0
         skipped_count = 0
@@ -368,8 +368,8 @@ async def import_all_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 continue
 
             settings = db.get_user_effective_settings(user_id)
-            stop_loss_price = price * (1 - settings['STOP_LOSS_PERCENTAGE'] / 100)
-            take_profit_price = price * (1 + settings['PROFIT_TARGET_PERCENTAGE'] / 100)
+            stop_loss_price = price * settings['SL_MULT']
+            take_profit_price = price * settings['TP_MULT']
 
             db.log_trade(
                 user_id=user_id, coin_symbol=symbol, buy_price=price,
@@ -423,21 +423,21 @@ async def buy_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         if is_admin:
             live_balance = float('inf')
         else:
-            live_balance = trade.get_account_balance(user_id, 'USDT')
+            live_balance = await trade.run_blocking(trade.get_account_balance, user_id, 'USDT')
         if not is_admin and (live_balance is None or live_balance < usdt_amount):
             await update.message.reply_text(f"Your live USDT balance (`${live_balance:.2f}`) is insufficient for this quest.")
             return
 
         # Place the live order
         if is_admin:
-            order, entry_price, quantity = trade.place_buy_order(config.ADMIN_USER_ID, symbol, usdt_amount)
+            order, entry_price, quantity = await trade.run_blocking(trade.place_buy_order, config.ADMIN_USER_ID, symbol, usdt_amount)
         else:
-            order, entry_price, quantity = trade.place_buy_order(user_id, symbol, usdt_amount)
+            order, entry_price, quantity = await trade.run_blocking(trade.place_buy_order, user_id, symbol, usdt_amount)
 
         # Log the successful trade
         settings = db.get_user_effective_settings(user_id)
-        stop_loss_price = entry_price * (1 - settings['STOP_LOSS_PERCENTAGE'] / 100)
-        take_profit_price = entry_price * (1 + settings['PROFIT_TARGET_PERCENTAGE'] / 100)
+        stop_loss_price = entry_price * settings['SL_MULT']
+        take_profit_price = entry_price * settings['TP_MULT']
         db.log_trade(user_id=user_id, coin_symbol=symbol, buy_price=entry_price,
                      stop_loss=stop_loss_price, take_profit=take_profit_price,
                      mode='LIVE', trade_size_usdt=usdt_amount, quantity=quantity)
@@ -853,11 +853,22 @@ async def learn_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
 def main() -> None:
     """Start the bot."""
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     db.initialize_database()
     # Run schema migrations to ensure DB is up to date
     db.migrate_schema()
 
-    application = Application.builder().token(config.TELEGRAM_BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(config.TELEGRAM_BOT_TOKEN)
+        # Same pool size PTB uses for its default bot request
+        .request(trade.FastJsonRequest(connection_pool_size=256))
+        .get_updates_request(trade.FastJsonRequest())
+        .post_init(trade.start_background_tasks)
+        .post_shutdown(trade.stop_market_streams)
+        .build()
+    )
 
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
@@ -898,7 +909,9 @@ def main() -> None:
     # --- Set up background jobs ---
     job_queue = application.job_queue
     # Schedule the auto-scan job to run every 10 minutes (600 seconds).
-    job_queue.run_repeating(trade.scheduled_monitoring_job, interval=60, first=10) # This job now handles all monitoring
+    job_queue.run_repeating(trade.scheduled_monitoring_job, interval=60, first=10, job_kwargs=trade.SINGLE_INSTANCE_JOB) # This job now handles all monitoring
+    job_queue.run_repeating(trade.keep_binance_connection_warm, interval=60, first=40)
+    job_queue.run_repeating(trade.repin_binance_endpoint, interval=3600, first=3600)
     # Schedule the daily summary job to run at 8:00 AM UTC
     job_queue.run_daily(send_daily_status_summary, time=datetime(1, 1, 1, 8, 0, 0, tzinfo=timezone.utc).time())
     job_queue.run_repeating(autotrade_jobs.autotrade_cycle, interval=300, first=10)
@@ -1,9 +1,24 @@
 # Database access functions for Lunara Bot
 import sqlite3
+import threading
+
+_local = threading.local()
 
 def get_db_connection():
-    conn = sqlite3.connect('lunara_bot.db')
-    conn.row_factory = sqlite3.Row
+    """
+    The calling thread's connection, opened on first use and reused after that, so a
+    monitor scan no longer opens one connection per query. WAL lets readers and the
+    writer proceed without blocking each other; synchronous=NORMAL is durable under WAL.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        # Room for every distinct query here, including the IN (...) variants per batch size,
+        # so repeated job queries reuse their compiled statements instead of re-parsing
+        conn = sqlite3.connect('lunara_bot.db', cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
     return conn
 
 def initialize_database():
@@ -82,6 +97,12 @@ def initialize_database():
             closed_at DATETIME
         );
     """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS kv (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """)
     conn.commit()
 
 def migrate_schema():
@@ -118,6 +139,12 @@ def migrate_schema():
         cursor.execute("ALTER TABLE trades ADD COLUMN current_dsl_stage INTEGER DEFAULT 0")
         changes_made = True
 
+    cursor.execute("PRAGMA index_list(trades)")
+    if 'idx_trades_status_pnl' not in {info[1] for info in cursor.fetchall()}:
+        # Lets the adaptive strategy's closed-trade aggregates read an index range
+        cursor.execute("CREATE INDEX idx_trades_status_pnl ON trades (status, pnl_percentage)")
+        changes_made = True
+
     cursor.execute("PRAGMA table_info(users)")
     user_columns = [info[1] for info in cursor.fetchall()]
 
@@ -160,11 +187,18 @@ def set_autotrade_status(user_id: int, enabled: bool):
     conn.commit()
 
 def get_open_trades(user_id: int):
-    """Retrieves all open trades for a specific user."""
+    """
+    Retrieves all open trades for a specific user, with every column the monitor reads so
+    callers can index the rows directly.
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute(
-        "SELECT id, user_id, coin_symbol, buy_price, buy_timestamp, stop_loss_price, take_profit_price FROM trades WHERE user_id = ? AND status = 'open'", (user_id,)
+        "SELECT id, user_id, coin_symbol, buy_price, buy_timestamp, stop_loss_price, take_profit_price, "
+        "mode, quantity, trade_size_usdt, rsi_at_buy, "
+        # SQLite converts buy_timestamp to epoch milliseconds so the monitor doesn't parse it per trade
+        "CAST(strftime('%s', buy_timestamp) AS INTEGER) * 1000 AS buy_ts_ms "
+        "FROM trades WHERE user_id = ? AND status = 'open'", (user_id,)
     )
     return cursor.fetchall()
 
@@ -174,14 +208,23 @@ def get_user_trading_mode_and_balance(user_id: int):
     return user['trading_mode'], user['paper_balance']
 
 
+# SQLite converts add_timestamp to epoch seconds so callers don't strptime per row
+_WATCHLIST_COLUMNS = "id, user_id, coin_symbol, add_timestamp, CAST(strftime('%s', add_timestamp) AS INTEGER) AS add_ts_epoch"
+
 def get_watched_items_by_user(user_id: int):
     """Retrieves all watched symbols for a specific user."""
     conn = get_db_connection()
     items = conn.execute(
-        "SELECT coin_symbol, add_timestamp FROM watchlist WHERE user_id = ?", (user_id,)
+        f"SELECT {_WATCHLIST_COLUMNS} FROM watchlist WHERE user_id = ?", (user_id,)
     ).fetchall()
     return items
 
+def get_all_watchlist_items():
+    """Retrieves every watched symbol across all users."""
+    conn = get_db_connection()
+    items = conn.execute(f"SELECT {_WATCHLIST_COLUMNS} FROM watchlist").fetchall()
+    return items
+
 def get_user_api_keys(user_id: int):
     """
     Retrieves and decrypts a user's Binance API keys.
@@ -218,6 +261,34 @@ def get_user_effective_settings(user_id: int) -> dict:
     user_data = conn.execute("SELECT * FROM users WHERE user_id = ?", (user_id,)).fetchone()
     if not user_data:
         return settings
+    return _apply_custom_settings(settings, user_data)
+
+def get_effective_settings_bulk(user_ids) -> dict:
+    """
+    Effective settings for several users at once, keyed by user_id, reading all
+    their user rows in a single query. Users without a row fall back to
+    get_user_effective_settings, which creates them.
+    """
+    import config
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    conn = get_db_connection()
+    placeholders = ",".join("?" * len(user_ids))
+    rows = conn.execute(f"SELECT * FROM users WHERE user_id IN ({placeholders})", user_ids).fetchall()
+    settings_by_user = {}
+    for user_data in rows:
+        user_id = user_data['user_id']
+        tier = 'PREMIUM' if user_id == getattr(config, 'ADMIN_USER_ID', None) else user_data['subscription_tier']
+        settings_by_user[user_id] = _apply_custom_settings(config.get_active_settings(tier).copy(), user_data)
+    for user_id in user_ids:
+        if user_id not in settings_by_user:
+            settings_by_user[user_id] = get_user_effective_settings(user_id)
+    return settings_by_user
+
+def _apply_custom_settings(settings: dict, user_data) -> dict:
+    """Layers a user row's custom_* overrides onto tier defaults."""
+    import config
     user_keys = user_data.keys()
     # Override defaults with custom settings if they exist (are not NULL)
     if 'custom_rsi_buy' in user_keys and user_data['custom_rsi_buy'] is not None:
@@ -230,7 +301,8 @@ def get_user_effective_settings(user_id: int) -> dict:
         settings['TRAILING_PROFIT_ACTIVATION_PERCENT'] = user_data['custom_trailing_activation']
     if 'custom_trailing_drop' in user_keys and user_data['custom_trailing_drop'] is not None:
         settings['TRAILING_STOP_DROP_PERCENT'] = user_data['custom_trailing_drop']
-    return settings
+    # Custom stop-loss changes the derived multiplier
+    return config.with_exit_multipliers(settings)
 
 def is_trade_open(user_id: int, coin_symbol: str):
     """Checks if a user already has an open trade for a specific symbol."""
@@ -268,6 +340,27 @@ def get_global_top_trades(limit: int = 3):
     '''
     return conn.execute(query, (limit,)).fetchall()
 
+def get_symbol_status(user_id: int, coin_symbol: str) -> dict:
+    """Whether a user has an open trade and/or a watchlist entry for a symbol, in one query."""
+    conn = get_db_connection()
+    row = conn.execute(
+        """
+        SELECT EXISTS(SELECT 1 FROM trades WHERE user_id = ? AND coin_symbol = ? AND status = 'open') AS open,
+               EXISTS(SELECT 1 FROM watchlist WHERE user_id = ? AND coin_symbol = ?) AS watchlist
+        """,
+        (user_id, coin_symbol, user_id, coin_symbol)
+    ).fetchone()
+    return {'open': bool(row['open']), 'watchlist': bool(row['watchlist'])}
+
+def get_active_symbols(user_id: int) -> set:
+    """Symbols a user has an open trade in or is watching, in one query."""
+    conn = get_db_connection()
+    rows = conn.execute(
+        "SELECT coin_symbol FROM trades WHERE user_id = ? AND status = 'open' UNION SELECT coin_symbol FROM watchlist WHERE user_id = ?",
+        (user_id, user_id)
+    ).fetchall()
+    return {row['coin_symbol'] for row in rows}
+
 def is_on_watchlist(user_id: int, coin_symbol: str):
     """Checks if a user is already watching a specific symbol."""
     conn = get_db_connection()
@@ -276,3 +369,86 @@ def is_on_watchlist(user_id: int, coin_symbol: str):
         (user_id, coin_symbol)
     ).fetchone()
     return item is not None
+
+def get_closed_trades_signature():
+    """
+    (count, total P/L) of closed trades, read from idx_trades_status_pnl alone; it changes
+    whenever a trade is closed, so aggregate readers can tell when to recompute.
+    """
+    conn = get_db_connection()
+    row = conn.execute("SELECT COUNT(*), TOTAL(pnl_percentage) FROM trades WHERE status = 'closed'").fetchone()
+    return tuple(row)
+
+def get_profitable_rsi_median():
+    """
+    Median RSI at buy across profitable closed trades, computed in SQL (the middle one or
+    two values of the sorted column, averaged). None if there are no such trades.
+    """
+    conn = get_db_connection()
+    row = conn.execute('''
+        WITH profitable AS (
+            SELECT rsi_at_buy FROM trades
+            WHERE status = 'closed' AND pnl_percentage > 0 AND rsi_at_buy IS NOT NULL
+        )
+        SELECT AVG(rsi_at_buy) FROM (
+            SELECT rsi_at_buy FROM profitable ORDER BY rsi_at_buy
+            LIMIT 2 - (SELECT COUNT(*) FROM profitable) % 2
+            OFFSET ((SELECT COUNT(*) FROM profitable) - 1) / 2
+        )
+    ''').fetchone()
+    return row[0]
+
+def get_top_coins_by_avg_pnl(limit: int = 5):
+    """Symbols with the highest mean P/L over closed trades that recorded RSI at buy, best first."""
+    conn = get_db_connection()
+    rows = conn.execute('''
+        SELECT coin_symbol FROM trades
+        WHERE status = 'closed' AND pnl_percentage IS NOT NULL AND rsi_at_buy IS NOT NULL
+        GROUP BY coin_symbol
+        ORDER BY AVG(pnl_percentage) DESC, coin_symbol
+        LIMIT ?
+    ''', (limit,)).fetchall()
+    return [row['coin_symbol'] for row in rows]
+
+def close_trades_bulk(rows, paper_credits=None):
+    """
+    Closes many trades in a single transaction and returns how many were still open.
+    `rows` is a list of (sell_price, close_reason, win_loss, pnl_percentage, coin_symbol, trade_id, user_id).
+    `paper_credits` maps trade_id -> paper-balance change for paper trades. A row's credit and
+    its coin_performance update are only applied if that row's trade was actually closed here.
+    """
+    if not rows:
+        return 0
+    paper_credits = paper_credits or {}
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    closed = 0
+    for sell_price, close_reason, win_loss, pnl, coin_symbol, trade_id, user_id in rows:
+        cursor.execute(
+            "UPDATE trades SET status = 'closed', sell_price = ?, close_reason = ?, win_loss = ?, pnl_percentage = ? WHERE id = ? AND user_id = ? AND status = 'open'",
+            (sell_price, close_reason, win_loss, pnl, trade_id, user_id)
+        )
+        if not cursor.rowcount:
+            # Already closed elsewhere, so it was credited and counted then
+            continue
+        closed += 1
+        if trade_id in paper_credits:
+            cursor.execute("UPDATE users SET paper_balance = paper_balance + ? WHERE user_id = ?", (paper_credits[trade_id], user_id))
+        cursor.execute(
+            "INSERT INTO coin_performance (coin_symbol, wins, losses, total_pnl_percentage) VALUES (?, ?, ?, ?) ON CONFLICT(coin_symbol) DO UPDATE SET wins = wins + excluded.wins, losses = losses + excluded.losses, total_pnl_percentage = total_pnl_percentage + excluded.total_pnl_percentage",
+            (coin_symbol, 1 if win_loss == 'win' else 0, 1 if win_loss == 'loss' else 0, pnl)
+        )
+    conn.commit()
+    return closed
+
+def get_kv(key: str, default=None):
+    """Reads a small piece of persisted bot state (e.g. the last market state)."""
+    conn = get_db_connection()
+    row = conn.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+    return row['value'] if row else default
+
+def set_kv(key: str, value: str):
+    """Persists a small piece of bot state so it survives restarts."""
+    conn = get_db_connection()
+    conn.execute("INSERT INTO kv (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+    conn.commit()
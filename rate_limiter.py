@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+class AsyncTokenBucket:
+    """
+    Async token-bucket limiter: allows `rate` acquisitions per `per` seconds,
+    with bursts of up to `rate`. Waiters sleep until enough tokens refill
+    instead of firing requests that Binance would answer with a 429.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0):
+        self.capacity = float(rate)
+        self.fill_rate = rate / per
+        self.tokens = float(rate)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+        self.updated_at = now
+
+    async def acquire(self, tokens: float = 1.0):
+        # The lock keeps waiters in FIFO order so a large request is not starved
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.fill_rate)
+                self._refill()
+            self.tokens -= tokens
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
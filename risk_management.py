@@ -24,11 +24,12 @@ def is_market_crash_or_big_buyer(prices: dict) -> bool:
 def get_atr_stop(entry_price, atr, multiplier=1.5):
     return entry_price - multiplier * atr
 
-def update_daily_pl(trade_result, db):
-    today = datetime.date.today().isoformat()
+def update_daily_pl(trade_result, db, today=None):
+    # Callers closing several trades at once can pass the UTC date they computed
+    today = today or datetime.datetime.now(datetime.timezone.utc).date().isoformat()
     db.update_daily_pl(today, trade_result)
 
 def should_pause_trading(db, account_balance, max_drawdown_pct=0.10):
-    today = datetime.date.today().isoformat()
+    today = datetime.datetime.now(datetime.timezone.utc).date().isoformat()
     daily_pl = db.get_daily_pl(today)
     return daily_pl < -account_balance * max_drawdown_pct
@@ -52,7 +52,7 @@ async def wallet_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     await update.message.reply_text("Fetching your spot wallet balances from Binance...")
     try:
-        balances = trade.get_all_spot_balances(user_id)
+        balances = await trade.run_blocking(trade.get_all_spot_balances, user_id)
         if not balances:
             await update.message.reply_text("You do not seem to have any assets in your spot wallet.")
             return
@@ -90,6 +90,7 @@ async def set_api_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     db.set_user_api_keys(user_id, api_key, secret_key)
+    trade.invalidate_user_client(user_id)
     await update.message.reply_text("Your Binance API keys have been securely saved.")
 
 async def set_mode_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
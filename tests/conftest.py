@@ -0,0 +1,13 @@
+import pytest
+from modules import db_access
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    """A connection to an empty, migrated database in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    db_access._local.conn = None
+    db_access.initialize_database()
+    db_access.migrate_schema()
+    yield db_access.get_db_connection()
+    db_access._local.conn.close()
+    db_access._local.conn = None
@@ -0,0 +1,35 @@
+from bounded_map import ShadowMap
+
+def test_shadow_map_is_bounded_and_keeps_recently_read_keys():
+    store = ShadowMap(max_size=3)
+    for i in range(3):
+        store[i] = str(i)
+    assert store.get(0) == '0'  # promoted out of the shadow generation
+    for i in range(3, 6):
+        store[i] = str(i)
+    assert 0 in store and store[0] == '0'
+    assert 1 not in store and 2 not in store
+    assert len(store) <= 2 * store.max_size
+
+def test_shadow_map_items_is_a_snapshot_under_concurrent_writes():
+    import threading
+    store = ShadowMap(max_size=8)
+    stop = threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            store[i % 50] = i
+            store.get((i * 7) % 50)
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            for _key, _value in store.items():
+                pass
+    finally:
+        stop.set()
+        thread.join()
+    assert len(store) <= 2 * store.max_size
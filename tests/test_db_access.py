@@ -5,3 +5,42 @@ def test_db_connection():
     conn = db_access.get_db_connection()
     assert conn is not None
     assert hasattr(conn, 'execute')
+
+def _open_paper_trade(conn, symbol):
+    cursor = conn.execute(
+        "INSERT INTO trades (user_id, coin_symbol, buy_price, status, mode, trade_size_usdt) VALUES (1, ?, 100, 'open', 'PAPER', 50)",
+        (symbol,)
+    )
+    conn.commit()
+    return cursor.lastrowid
+
+def test_close_trades_bulk_only_credits_and_counts_rows_it_closed(fresh_db):
+    db_access.get_or_create_user(1)
+    balance = db_access.get_user_trading_mode_and_balance(1)[1]
+    already_closed = _open_paper_trade(fresh_db, 'AAAUSDT')
+    still_open = _open_paper_trade(fresh_db, 'BBBUSDT')
+    fresh_db.execute("UPDATE trades SET status = 'closed' WHERE id = ?", (already_closed,))
+    fresh_db.commit()
+
+    closed = db_access.close_trades_bulk(
+        [(110, 'Stop-Loss', 'win', 10.0, 'AAAUSDT', already_closed, 1),
+         (90, 'Stop-Loss', 'loss', -10.0, 'BBBUSDT', still_open, 1)],
+        {already_closed: 5.0, still_open: -5.0}
+    )
+
+    assert closed == 1
+    assert db_access.get_user_trading_mode_and_balance(1)[1] == balance - 5.0
+    performance = {row['coin_symbol']: row for row in fresh_db.execute("SELECT * FROM coin_performance")}
+    assert list(performance) == ['BBBUSDT']
+    assert performance['BBBUSDT']['losses'] == 1
+
+def test_close_trades_bulk_closes_nothing_twice(fresh_db):
+    db_access.get_or_create_user(1)
+    balance = db_access.get_user_trading_mode_and_balance(1)[1]
+    trade_id = _open_paper_trade(fresh_db, 'AAAUSDT')
+    row = (110, 'RSI Exit', 'win', 10.0, 'AAAUSDT', trade_id, 1)
+
+    assert db_access.close_trades_bulk([row], {trade_id: 5.0}) == 1
+    assert db_access.close_trades_bulk([row], {trade_id: 5.0}) == 0
+    assert db_access.get_user_trading_mode_and_balance(1)[1] == balance + 5.0
+    assert fresh_db.execute("SELECT wins FROM coin_performance").fetchone()['wins'] == 1
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from indicators import batch_indicators, bollinger_from_sums, calc_bollinger, calc_macd, calc_rsi, rsi_from_averages, scan_trades, wilder_averages, wilder_step
+
+def test_rsi_all_gains_is_100():
+    closes = np.arange(1.0, 30.0)
+    assert calc_rsi(closes, period=14) == 100.0
+
+def test_rsi_uses_wilder_smoothing():
+    closes = np.array([44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08,
+                       45.89, 46.03, 45.61, 46.28, 46.28, 46.00, 46.03, 46.41, 46.22, 45.64])
+    deltas = np.diff(closes)
+    gains, losses = np.clip(deltas, 0, None), np.clip(-deltas, 0, None)
+    avg_gain, avg_loss = gains[:14].mean(), losses[:14].mean()
+    for g, l in zip(gains[14:], losses[14:]):
+        avg_gain = (avg_gain * 13 + g) / 14
+        avg_loss = (avg_loss * 13 + l) / 14
+    expected = 100 - 100 / (1 + avg_gain / avg_loss)
+    assert abs(calc_rsi(closes, period=14) - expected) < 1e-9
+
+def test_wilder_step_continues_full_smoothing():
+    closes = np.array([44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08,
+                       45.89, 46.03, 45.61, 46.28, 46.28, 46.00, 46.03, 46.41, 46.22, 45.64])
+    avg_gain, avg_loss = wilder_averages(closes[:15], period=14)
+    for prev, close in zip(closes[14:-1], closes[15:]):
+        avg_gain, avg_loss = wilder_step(avg_gain, avg_loss, close - prev, period=14)
+    assert abs(rsi_from_averages(avg_gain, avg_loss) - calc_rsi(closes, period=14)) < 1e-9
+
+def test_scan_trades_masks_skip_nan_prices():
+    buy = np.array([100.0, 100.0, 100.0])
+    sl = np.array([95.0, 95.0, 95.0])
+    tp = np.array([110.0, 110.0, 110.0])
+    cur = np.array([96.0, 109.0, np.nan])
+    pnl, near_sl, near_tp = scan_trades(buy, sl, tp, cur, 2.0, 2.0)
+    assert pnl[0] == -4.0 and abs(pnl[1] - 9.0) < 1e-9
+    assert near_sl.tolist() == [True, False, False]
+    assert near_tp.tolist() == [False, True, False]
+
+@pytest.mark.parametrize("fast, slow, signal_period", [(12, 26, 9), (5, 35, 5)])
+def test_macd_matches_pandas_ewm(fast, slow, signal_period):
+    pd = pytest.importorskip("pandas")
+    closes = np.linspace(100.0, 120.0, 60) + np.sin(np.arange(60))
+    series = pd.Series(closes)
+    macd_line = series.ewm(span=fast, adjust=False).mean() - series.ewm(span=slow, adjust=False).mean()
+    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+    macd, signal, histogram = calc_macd(closes, fast, slow, signal_period)
+    assert abs(macd - macd_line.iloc[-1]) < 1e-9
+    assert abs(signal - signal_line.iloc[-1]) < 1e-9
+    assert abs(histogram - (macd_line.iloc[-1] - signal_line.iloc[-1])) < 1e-9
+
+def test_bollinger_from_rolling_sums_matches_full_window():
+    rng = np.random.default_rng(1)
+    closes = 60000.0 + np.cumsum(rng.normal(0.0, 50.0, 200))
+    period, shift = 20, closes[0]
+    shifted = closes[:period] - shift
+    total, total_sq = shifted.sum(), (shifted ** 2).sum()
+    for i in range(period, len(closes)):
+        x, y = closes[i] - shift, closes[i - period] - shift
+        total += x - y
+        total_sq += x * x - y * y
+    expected = calc_bollinger(closes, period)
+    window = closes[-period:]
+    assert np.allclose(expected, (window.mean() + 2 * window.std(), window.mean(), window.mean() - 2 * window.std(), window.std()), rtol=1e-9)
+    assert np.allclose(bollinger_from_sums(total, total_sq, period, 2, shift), expected, rtol=1e-9)
+
+def test_batch_indicators_match_single_symbol_functions():
+    rng = np.random.default_rng(2)
+    closes = 100.0 + np.cumsum(rng.normal(0.0, 1.0, (3, 100)), axis=1)
+    out = batch_indicators(closes)
+    for r, row in enumerate(closes):
+        upper, sma, lower, std = calc_bollinger(row, 20, 2)
+        expected = (calc_rsi(row, 14), upper, sma, lower, std, *calc_macd(row)[:2])
+        assert np.allclose(out[:, r], expected, rtol=1e-9)
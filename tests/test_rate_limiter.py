@@ -0,0 +1,17 @@
+import asyncio
+import time
+from rate_limiter import AsyncTokenBucket
+
+def test_bucket_allows_burst_then_throttles():
+    async def run():
+        bucket = AsyncTokenBucket(rate=5, per=0.5)
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        burst = time.monotonic() - start
+        await bucket.acquire()
+        return burst, time.monotonic() - start
+
+    burst, total = asyncio.run(run())
+    assert burst < 0.05
+    assert total >= 0.09
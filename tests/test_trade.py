@@ -1,4 +1,9 @@
+import asyncio
+from types import SimpleNamespace
+
 import pytest
+import trade
+from modules import db_access
 from trade import TradeError, get_rsi
 
 def test_rsi_returns_float():
@@ -9,3 +14,93 @@ def test_rsi_returns_float():
 def test_trade_error():
     with pytest.raises(TradeError):
         raise TradeError("Test error")
+
+def test_monitoring_cycle_keeps_paper_trade_between_sl_and_tp_open(fresh_db, monkeypatch):
+    monkeypatch.setattr(trade, 'client', object())
+    db_access.get_or_create_user(1)
+    fresh_db.execute(
+        "INSERT INTO trades (user_id, coin_symbol, buy_price, status, stop_loss_price, take_profit_price, mode, trade_size_usdt) "
+        "VALUES (1, 'ABCUSDT', 100, 'open', 90, 120, 'PAPER', 50)"
+    )
+    fresh_db.commit()
+    balance = db_access.get_user_trading_mode_and_balance(1)[1]
+    open_trades = db_access.get_open_trades(1)
+    context = SimpleNamespace(bot_data={})
+    asyncio.run(trade.run_monitoring_cycle(context, open_trades, {'ABCUSDT': 105.0}, {'ABCUSDT': {'rsi': 50.0}}))
+    assert fresh_db.execute("SELECT status FROM trades").fetchone()['status'] == 'open'
+    assert fresh_db.execute("SELECT COUNT(*) FROM coin_performance").fetchone()[0] == 0
+    assert db_access.get_user_trading_mode_and_balance(1)[1] == balance
+
+def test_monitoring_cycle_credits_paper_stop_loss(fresh_db, monkeypatch):
+    monkeypatch.setattr(trade, 'client', object())
+    # db_access has no daily P/L table yet
+    monkeypatch.setattr(trade, 'update_daily_pl', lambda *args: None)
+    db_access.get_or_create_user(1)
+    fresh_db.execute(
+        "INSERT INTO trades (user_id, coin_symbol, buy_price, status, stop_loss_price, take_profit_price, mode, trade_size_usdt) "
+        "VALUES (1, 'ABCUSDT', 100, 'open', 90, 120, 'PAPER', 50)"
+    )
+    fresh_db.commit()
+    balance = db_access.get_user_trading_mode_and_balance(1)[1]
+    open_trades = db_access.get_open_trades(1)
+    context = SimpleNamespace(bot_data={})
+    asyncio.run(trade.run_monitoring_cycle(context, open_trades, {'ABCUSDT': 80.0}, {'ABCUSDT': {'rsi': 50.0}}))
+    row = fresh_db.execute("SELECT status, close_reason FROM trades").fetchone()
+    assert (row['status'], row['close_reason']) == ('closed', 'Stop-Loss')
+    # 50 USDT bought at 100 and stopped out at 80
+    assert db_access.get_user_trading_mode_and_balance(1)[1] == pytest.approx(balance - 10.0)
+
+def test_reactive_refresh_keeps_other_symbols_near_zone(monkeypatch):
+    monkeypatch.setattr(trade, '_trade_levels', {})
+    monkeypatch.setattr(trade, '_trade_zones', {})
+    monkeypatch.setattr(trade, '_wakeup_symbols', set())
+    open_trades = [
+        {'id': 1, 'coin_symbol': 'AAAUSDT', 'stop_loss_price': 90.0, 'take_profit_price': 120.0},
+        {'id': 2, 'coin_symbol': 'BBBUSDT', 'stop_loss_price': 90.0, 'take_profit_price': 120.0},
+    ]
+    trade._refresh_trade_levels(open_trades, {})
+    # Both symbols tick into the near-SL zone
+    for symbol in ('AAAUSDT', 'BBBUSDT'):
+        trade._check_trade_levels(symbol, 91.0, trade._trade_levels[symbol])
+    assert trade._wakeup_symbols == {'AAAUSDT', 'BBBUSDT'}
+    trade._wakeup_symbols.clear()
+
+    # The stream-triggered run for AAA prices only AAA; BBB's zone must survive it
+    trade._refresh_trade_levels(open_trades, {'AAAUSDT': 91.0})
+    assert trade._trade_zones == {1: 1, 2: 1}
+    trade._check_trade_levels('BBBUSDT', 91.0, trade._trade_levels['BBBUSDT'])
+    assert trade._wakeup_symbols == set()
+
+def test_ttl_cache_skips_results_rejected_by_cache_if():
+    calls = []
+
+    @trade.ttl_cache(ttl=60, cache_if=trade.has_values)
+    def indicator(symbol):
+        calls.append(symbol)
+        return (None, None) if symbol == 'BAD' else (1.0, 2.0)
+
+    indicator('BAD'), indicator('BAD')
+    indicator('GOOD'), indicator('GOOD')
+    assert calls == ['BAD', 'BAD', 'GOOD']
+
+def test_streamed_btc_close_already_seeded_over_rest_is_not_stored_twice(monkeypatch):
+    monkeypatch.setattr(trade, '_btc_hourly_closes', trade.deque(maxlen=2))
+    now_ms = int(trade.time.time() * 1000)
+    last_closed_open = now_ms - now_ms % trade.BTC_CANDLE_MS - trade.BTC_CANDLE_MS
+    # REST seeded the two latest closed candles, then the stream pushes the newer one again
+    trade._store_btc_hourly_close(last_closed_open - trade.BTC_CANDLE_MS, 100.0)
+    trade._store_btc_hourly_close(last_closed_open, 101.0)
+    trade._store_btc_hourly_close(last_closed_open, 101.0)
+    assert trade._streamed_btc_hourly_closes() == (100.0, 101.0)
+
+def test_new_open_trade_symbol_flags_kline_resubscribe(monkeypatch):
+    monkeypatch.setattr(trade, '_trade_levels', {})
+    monkeypatch.setattr(trade, '_trade_zones', {})
+    monkeypatch.setattr(trade, '_kline_trade_symbols', frozenset({'AAAUSDT'}))
+    monkeypatch.setattr(trade, '_kline_resubscribe', False)
+    open_trades = [{'id': 1, 'coin_symbol': 'AAAUSDT', 'stop_loss_price': 90.0, 'take_profit_price': 120.0}]
+    trade._refresh_trade_levels(open_trades, {})
+    assert trade._kline_resubscribe is False
+    open_trades.append({'id': 2, 'coin_symbol': 'BBBUSDT', 'stop_loss_price': 90.0, 'take_profit_price': 120.0})
+    trade._refresh_trade_levels(open_trades, {})
+    assert trade._kline_resubscribe is True
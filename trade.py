@@ -12,7 +12,7 @@ class TradeError(Exception):
     pass
 
 from telegram import Update
-from telegram.ext import CommandHandler, ContextTypes
+from telegram.ext import CallbackContext, CommandHandler, ContextTypes
 HELP_MESSAGE = (
     "🤖 *Lunessa Shi’ra Gork* – Automated Crypto Trading Bot\n\n"
     "*Features:*\n"
@@ -43,92 +43,517 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def about_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(ABOUT_MESSAGE, parse_mode='Markdown')
 
-import logging
 import numpy as np
+import threading
 import time
 import asyncio
-import math
-from datetime import datetime, timezone
-import logging
-import numpy as np
-from indicators import calc_atr
+import json
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+from indicators import batch_indicators, bollinger_from_sums, calc_atr, calc_macd, kline_column, wilder_averages, wilder_step, rsi_from_averages, scan_trades
+from rate_limiter import AsyncTokenBucket
+from bounded_map import ShadowMap
 from risk_management import get_trade_size, get_atr_stop, update_daily_pl, should_pause_trading, is_market_crash_or_big_buyer
 from modules.monitoring import ai_trade_monitor
 from modules.adaptive_strategy import adaptive_strategy_job
+from binance import AsyncClient, BinanceSocketManager
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from binance.client import Client
-from binance.exceptions import BinanceAPIException
-from telegram import Update
-from telegram.ext import ContextTypes
-import pandas as pd
-from functools import lru_cache
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; responses fall back to requests' json decoding
+    orjson = None
+try:
+    import h2  # noqa: F401  optional: lets httpx multiplex Bot API calls over one HTTP/2 connection
+    TELEGRAM_HTTP_VERSION = '2'
+except ImportError:
+    TELEGRAM_HTTP_VERSION = '1.1'
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+from binance.helpers import interval_to_milliseconds
+from telegram.error import RetryAfter
+from telegram.request import HTTPXRequest
+from functools import lru_cache, wraps
+from operator import itemgetter
 import re
+from collections import OrderedDict, defaultdict, deque
 
 from Simulation import resonance_engine
 from trading_module import TradeAction
 import config
 from modules import db_access as db
 import memory
-import statistics
 
 # --- Market Crash/Big Buyer Shield ---
 # Now imported from risk_management.py
 
-@lru_cache(maxsize=128)
-def get_symbol_info(symbol: str):
+def ttl_cache(ttl: float, maxsize: int = 512, expires_in=None, cache_if=None):
     """
-    Fetches and caches trading rules for a symbol, like precision.
-    Returns a dictionary with symbol information or None on error.
+    Caches a function's results per argument tuple for `ttl` seconds, keeping at most
+    `maxsize` entries (least recently used evicted first).
+    None results (API errors, missing data) are never cached, nor are results `cache_if`
+    (if given) returns False for, e.g. the all-None tuples some indicators fail with.
+    `expires_in`, if given, is called with the same arguments and caps an entry's
+    lifetime in seconds, e.g. so a value built on a forming candle dies when it closes.
     """
+    def decorator(func):
+        cache = OrderedDict()
+        # Cached functions run in worker threads; the lock covers the cache only, not the call
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(key)
+                if hit is not None and hit[1] > now:
+                    cache.move_to_end(key)
+                    return hit[0]
+            value = func(*args, **kwargs)
+            if value is not None and (cache_if is None or cache_if(value)):
+                lifetime = ttl if expires_in is None else min(ttl, expires_in(*args, **kwargs))
+                with lock:
+                    cache[key] = (value, now + lifetime)
+                    cache.move_to_end(key)
+                    if len(cache) > maxsize:
+                        cache.popitem(last=False)
+            return value
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+def has_values(result):
+    """False for an all-None tuple, the failure result of the multi-value indicators; a cache_if."""
+    return any(value is not None for value in result)
+
+def until_candle_close(symbol, interval=Client.KLINE_INTERVAL_1HOUR, *args, **kwargs):
+    """Seconds until the forming `interval` candle closes; an expires_in for kline-based caches."""
+    interval_seconds = interval_to_milliseconds(interval) / 1000
+    return interval_seconds - time.time() % interval_seconds
+
+# Every symbol's trading rules from one exchangeInfo download, refreshed hourly so
+# filter changes (tick/lot sizes, delistings) are picked up
+SYMBOL_INFO_TTL_SECONDS = 3600
+_symbol_info: dict[str, dict] = {}
+_symbol_info_loaded_at = float('-inf')  # monotonic time can be below the TTL right after boot
+_symbol_info_lock = threading.Lock()
+
+# The fields kept per symbol; the rest of exchangeInfo is not used and not persisted
+_SYMBOL_INFO_FIELDS = ('symbol', 'status', 'baseAsset', 'quoteAsset', 'filters')
+
+def _index_symbol_info(symbols):
+    """symbol -> info, with each symbol's filters indexed by type and its quantity precision."""
+    for info in symbols:
+        # Indexed once here so order paths look a filter up instead of scanning the list
+        info['filters_by_type'] = {f['filterType']: f for f in info['filters']}
+        lot_size = info['filters_by_type'].get('LOT_SIZE')
+        if lot_size:
+            # Decimal places of the step size, read exactly from its string ("0.00100000" -> 3)
+            info['qty_precision'] = max(0, -Decimal(lot_size['stepSize']).normalize().as_tuple().exponent)
+    return {info['symbol']: info for info in symbols}
+
+def _load_saved_symbol_info():
+    """Seeds the trading rules from the copy saved in the kv table, if it is still fresh."""
+    global _symbol_info, _symbol_info_loaded_at
     try:
-        if not client:
-            return None
-        return client.get_symbol_info(symbol)
-    except BinanceAPIException as e:
-        logger.error(f"Could not fetch symbol info for {symbol}: {e}")
-        return None
+        saved = db.get_kv('exchange_info')
+        if not saved:
+            return
+        saved = json.loads(saved)
+        age = time.time() - saved['saved_at']
+        if age > SYMBOL_INFO_TTL_SECONDS:
+            return
+        _symbol_info = _index_symbol_info(saved['symbols'])
+        _symbol_info_loaded_at = time.monotonic() - age
     except Exception as e:
-        logger.error(f"Unexpected error fetching symbol info for {symbol}: {e}")
+        logger.warning(f"Ignoring the saved exchange info: {e}")
+
+def refresh_symbol_info():
+    """Reloads the trading rules of every symbol if they are older than SYMBOL_INFO_TTL_SECONDS."""
+    global _symbol_info, _symbol_info_loaded_at
+    with _symbol_info_lock:
+        if not _symbol_info:
+            # After a restart the saved copy usually spares the ~1 MB exchangeInfo download
+            _load_saved_symbol_info()
+        if time.monotonic() - _symbol_info_loaded_at <= SYMBOL_INFO_TTL_SECONDS:
+            return
+        try:
+            exchange_info = client.get_exchange_info()
+            symbols = [{field: info[field] for field in _SYMBOL_INFO_FIELDS if field in info}
+                       for info in exchange_info['symbols']]
+            db.set_kv('exchange_info', json.dumps({'saved_at': time.time(), 'symbols': symbols}))
+            _symbol_info = _index_symbol_info(symbols)
+            _symbol_info_loaded_at = time.monotonic()
+        except BinanceAPIException as e:
+            logger.error(f"Could not fetch exchange info: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error fetching exchange info: {e}")
+
+def get_symbol_info(symbol: str):
+    """
+    Trading rules for a symbol, like precision, from the preloaded exchange info.
+    Returns a dictionary with symbol information or None if it is unknown or unavailable.
+    """
+    if not client:
         return None
+    if time.monotonic() - _symbol_info_loaded_at > SYMBOL_INFO_TTL_SECONDS:
+        refresh_symbol_info()
+    return _symbol_info.get(symbol)
+
+class FastJsonClient(Client):
+    """Binance client that decodes REST responses with orjson when it is installed."""
+
+    @staticmethod
+    def _handle_response(response):
+        if orjson is None or not (200 <= response.status_code < 300) or not response.content:
+            return Client._handle_response(response)
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise BinanceRequestException("Invalid Response: %s" % response.text)
+
+class FastJsonRequest(HTTPXRequest):
+    """
+    Telegram transport that parses Bot API responses with orjson and speaks HTTP/2 when
+    the optional orjson and h2 packages are installed.
+    """
+
+    def __init__(self, *args, http_version=None, **kwargs):
+        super().__init__(*args, http_version=http_version or TELEGRAM_HTTP_VERSION, **kwargs)
+
+    @staticmethod
+    def parse_json_payload(payload: bytes):
+        if orjson is None:
+            return HTTPXRequest.parse_json_payload(payload)
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            return HTTPXRequest.parse_json_payload(payload)  # Replaces invalid UTF-8 or raises TelegramError
+
+# '' is api.binance.com; the digits are the api1..api4 mirrors
+BINANCE_BASE_ENDPOINTS = ['', '1', '2', '3', '4']
+# Clients start on the default endpoint; repin_binance_endpoint moves them once measured
+_pinned_base_endpoint = ''
+
+def _measure_fastest_base_endpoint():
+    """Times /api/v3/ping against each Binance REST mirror and returns the fastest base endpoint."""
+    timings = {}
+    for endpoint in BINANCE_BASE_ENDPOINTS:
+        url = Client.API_URL.format(endpoint, 'com') + '/v3/ping'
+        try:
+            start = time.perf_counter()
+            requests.get(url, timeout=2).raise_for_status()
+            timings[endpoint] = time.perf_counter() - start
+        except requests.RequestException as e:
+            logger.warning(f"Binance endpoint {url} unreachable: {e}")
+    return min(timings, key=timings.get) if timings else ''
+
+def _make_client(api_key, secret_key):
+    """Creates a Binance client whose HTTP session keeps a pool of warm keep-alive connections."""
+    binance_client = FastJsonClient(api_key, secret_key, requests_params={'timeout': 10}, base_endpoint=_pinned_base_endpoint)
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+    binance_client.session.mount('https://', adapter)
+    binance_client.session.headers.update({'Connection': 'keep-alive'})
+    return binance_client
 
 # Initialize Binance client
 if config.BINANCE_API_KEY and config.BINANCE_SECRET_KEY:
-    client = Client(config.BINANCE_API_KEY, config.BINANCE_SECRET_KEY)
+    client = _make_client(config.BINANCE_API_KEY, config.BINANCE_SECRET_KEY)
 else:
     logger.warning("Binance API keys not found. Trading functions will be disabled.")
     client = None
 
+# user_id -> (api_key, client) in least-recently-used order; reused so each call does not
+# pay a new TLS handshake, ping and key decryption. Call invalidate_user_client when keys change.
+_user_clients = OrderedDict()
+# get_user_client runs in worker threads while the repin job reads the cache on the loop
+_user_clients_lock = threading.Lock()
+USER_CLIENT_CACHE_SIZE = 256
+
+def invalidate_user_client(user_id: int):
+    """Drops a user's cached client, e.g. after they set new API keys."""
+    with _user_clients_lock:
+        _user_clients.pop(user_id, None)
+
 def get_user_client(user_id: int):
     """Creates a Binance client instance for a specific user using their stored keys."""
+    with _user_clients_lock:
+        cached = _user_clients.get(user_id)
+        if cached:
+            _user_clients.move_to_end(user_id)
+            return cached[1]
+
     # For the admin user, prioritize API keys from config.py (loaded from .env)
     if user_id == config.ADMIN_USER_ID:
-        if config.BINANCE_API_KEY and config.BINANCE_SECRET_KEY:
-            try:
-                return Client(config.BINANCE_API_KEY, config.BINANCE_SECRET_KEY)
-            except Exception as e:
-                logger.error(f"Failed to create Binance client for ADMIN_USER_ID from config: {e}")
-                return None
-        else:
+        if not (config.BINANCE_API_KEY and config.BINANCE_SECRET_KEY):
             logger.warning("ADMIN_USER_ID detected, but BINANCE_API_KEY or BINANCE_SECRET_KEY not found in config.")
             return None
-
-    # For other users, fetch API keys from the database
-    api_key, secret_key = db.get_user_api_keys(user_id)
-    if not api_key or not secret_key:
-        logger.warning(f"API keys not found for user {user_id}.")
-        return None
+        if client:
+            return client
+        # The shared client failed to start; a dedicated one is built once and cached like a user's
+        api_key, secret_key = config.BINANCE_API_KEY, config.BINANCE_SECRET_KEY
+    else:
+        # For other users, fetch API keys from the database
+        api_key, secret_key = db.get_user_api_keys(user_id)
+        if not api_key or not secret_key:
+            logger.warning(f"API keys not found for user {user_id}.")
+            return None
     try:
-        return Client(api_key, secret_key)
+        user_client = _make_client(api_key, secret_key)
+        evicted = None
+        with _user_clients_lock:
+            _user_clients[user_id] = (api_key, user_client)
+            if len(_user_clients) > USER_CLIENT_CACHE_SIZE:
+                _, (_, evicted) = _user_clients.popitem(last=False)
+        if evicted:
+            evicted.session.close()
+        return user_client
     except Exception as e:
         logger.error(f"Failed to create Binance client for user {user_id}: {e}")
         return None
 
 def is_weekend():
     """Checks if the current day is Saturday or Sunday (UTC)."""
-    # weekday() returns 5 for Saturday, 6 for Sunday
-    return datetime.now(timezone.utc).weekday() >= 5
+    # The epoch fell on a Thursday (weekday 3), so the UTC weekday is plain integer arithmetic
+    return (int(time.time() // 86400) + 3) % 7 >= 5
+
+# --- Live market data from Binance websocket streams ---
+# Latest price per symbol, pushed every second by the !miniTicker@arr stream.
+PRICE_CACHE: dict[str, float] = {}
+# Streamed prices older than this are ignored in favour of a REST call.
+PRICE_STREAM_MAX_AGE_SECONDS = 30
+_price_cache_updated_at = 0.0
+# (open_time, close) of the two most recently closed BTCUSDT hourly candles, fed by the
+# kline stream and seeded over REST; only trusted while they are the latest adjacent pair.
+_btc_hourly_closes: deque = deque(maxlen=2)
+_stream_client = None
+# symbol -> [(trade_id, stop_loss, take_profit)] for the monitored open trades, refreshed each
+# time the monitor loads them, so the miniTicker consumer can react to a level crossing
+# between scheduled scans instead of waiting up to a minute for the next one
+_trade_levels: dict[str, list] = {}
+_trade_zones: dict[int, int] = {}
+_wakeup_symbols: set = set()
+_monitor_wakeup = asyncio.Event()
+# Scheduled and stream-triggered monitor runs never overlap
+_monitor_lock = asyncio.Lock()
+# A burst of crossings within this window is handled by one monitor run
+REACTIVE_MONITOR_DEBOUNCE_SECONDS = 0.5
+
+def get_streamed_price(symbol: str):
+    """Returns the websocket price for a symbol, or None if the stream is stale or missing it."""
+    if time.monotonic() - _price_cache_updated_at > PRICE_STREAM_MAX_AGE_SECONDS:
+        return None
+    return PRICE_CACHE.get(symbol)
+
+async def _consume_miniticker_stream(socket_manager):
+    global _price_cache_updated_at
+    async with socket_manager.miniticker_socket() as stream:
+        while True:
+            msgs = await stream.recv()
+            if isinstance(msgs, dict) and msgs.get('e') == 'error':
+                raise ConnectionError(msgs.get('m', 'miniTicker stream error'))
+            for m in msgs:
+                price = float(m['c'])
+                PRICE_CACHE[m['s']] = price
+                levels = _trade_levels.get(m['s'])
+                if levels:
+                    _check_trade_levels(m['s'], price, levels)
+            _price_cache_updated_at = time.monotonic()
+
+def _price_zone(price, stop_loss, take_profit):
+    """0 clear of both levels, 1 within the near-SL/TP alert thresholds, 2 at or through a level."""
+    if (stop_loss and price <= stop_loss) or (take_profit and price >= take_profit):
+        return 2
+    near_sl = stop_loss and price <= stop_loss * (1 + config.NEAR_STOP_LOSS_THRESHOLD_PERCENT / 100)
+    near_tp = take_profit and price >= take_profit * (1 - getattr(config, 'NEAR_TAKE_PROFIT_THRESHOLD_PERCENT', 2) / 100)
+    return 1 if near_sl or near_tp else 0
+
+def _check_trade_levels(symbol, price, levels):
+    """Wakes the reactive monitor when a streamed price moves a trade into a different zone."""
+    for trade_id, stop_loss, take_profit in levels:
+        zone = _price_zone(price, stop_loss, take_profit)
+        if zone != _trade_zones.get(trade_id, 0):
+            _trade_zones[trade_id] = zone
+            _wakeup_symbols.add(symbol)
+            _monitor_wakeup.set()
+
+def _refresh_trade_levels(open_trades, prices):
+    """
+    Rebuilds the per-symbol SL/TP levels from the open trades and recomputes the zones of
+    those priced in `prices`. Other trades keep their last zone: a stream-triggered run
+    prices only the crossed symbols, and resetting the rest to zone 0 would make their next
+    tick look like a crossing and wake the monitor again.
+    """
+    zones = {}
+    _trade_levels.clear()
+    for trade in open_trades:
+        symbol = trade['coin_symbol']
+        _trade_levels.setdefault(symbol, []).append((trade['id'], trade['stop_loss_price'], trade['take_profit_price']))
+        if symbol in prices:
+            zones[trade['id']] = _price_zone(prices[symbol], trade['stop_loss_price'], trade['take_profit_price'])
+        elif trade['id'] in _trade_zones:
+            zones[trade['id']] = _trade_zones[trade['id']]
+    # Closed trades drop out here
+    _trade_zones.clear()
+    _trade_zones.update(zones)
+    _note_open_trade_symbols(open_trades)
+
+async def _reactive_monitor(application):
+    """Runs the monitor for the symbols whose streamed price crossed an SL/TP threshold."""
+    context = CallbackContext(application)
+    while True:
+        await _monitor_wakeup.wait()
+        await asyncio.sleep(REACTIVE_MONITOR_DEBOUNCE_SECONDS)
+        _monitor_wakeup.clear()
+        symbols = set(_wakeup_symbols)
+        _wakeup_symbols.clear()
+        try:
+            await _monitor_symbols(context, symbols)
+        except Exception as e:
+            logger.error(f"Error in stream-triggered monitoring for {sorted(symbols)}: {e}", exc_info=True)
 
+async def _monitor_symbols(context, symbols):
+    user_id = config.ADMIN_USER_ID
+    if not user_id or not db.get_autotrade_status(user_id):
+        return
+    async with _monitor_lock:
+        open_trades = db.get_open_trades(user_id)
+        # Only the crossed symbols get a price, so every other trade is skipped this run
+        prices = {symbol: PRICE_CACHE[symbol] for symbol in symbols if symbol in PRICE_CACHE}
+        _refresh_trade_levels(open_trades, prices)
+        if not any(trade['coin_symbol'] in prices for trade in open_trades):
+            return
+        logger.info(f"Price crossed a trade level for {', '.join(sorted(prices))}; running the monitor now.")
+        indicator_cache = await prefetch_indicators([t for t in open_trades if t['coin_symbol'] in prices], prices)
+        await run_monitoring_cycle(context, open_trades, prices, indicator_cache)
+
+# The admin's open-trade symbols the kline stream is subscribed to, and whether that set has
+# changed since; the consumer reconnects with the new set so new trades get their candles too
+_kline_trade_symbols: frozenset = frozenset()
+_kline_resubscribe = False
+
+def _kline_stream_symbols():
+    """BTC, the AI-monitored coins and the admin's open-trade symbols get hourly kline streams."""
+    global _kline_trade_symbols, _kline_resubscribe
+    trade_symbols = frozenset()
+    if config.ADMIN_USER_ID:
+        trade_symbols = frozenset(trade['coin_symbol'] for trade in db.get_open_trades(config.ADMIN_USER_ID))
+    _kline_trade_symbols, _kline_resubscribe = trade_symbols, False
+    return sorted({"BTCUSDT", *getattr(config, "AI_MONITOR_COINS", []), *trade_symbols})
+
+def _note_open_trade_symbols(open_trades):
+    """Flags the kline stream for a resubscribe when the admin's open-trade symbols changed."""
+    global _kline_resubscribe
+    if frozenset(trade['coin_symbol'] for trade in open_trades) != _kline_trade_symbols:
+        _kline_resubscribe = True
+
+def _fold_closed_candle(symbol: str, kline: dict):
+    """Steps the cached hourly RSI state forward with a candle that just closed on the stream."""
+    state = _rsi_state.get((symbol, Client.KLINE_INTERVAL_1HOUR, 14))
+    if state is None:
+        return
+    candle_ms = kline['T'] - kline['t'] + 1
+    close = float(kline['c'])
+    with _indicator_state_lock:
+        if kline['t'] != state['last_open_time'] + candle_ms:
+            return  # Not the next candle (or get_rsi already applied it); get_rsi will catch up over REST
+        state['avg_gain'], state['avg_loss'] = wilder_step(state['avg_gain'], state['avg_loss'], close - state['last_close'], 14)
+        state['last_close'] = close
+        state['last_open_time'] = kline['t']
+        state['forming_close_time'] = kline['T'] + candle_ms
+
+def _fold_closed_candle_bollinger(symbol: str, kline: dict):
+    """Rolls every cached hourly Bollinger window for `symbol` forward by a closed candle."""
+    states = _bb_state.get(symbol)
+    if not states:
+        return
+    candle_ms = kline['T'] - kline['t'] + 1
+    close = float(kline['c'])
+    with _indicator_state_lock:
+        for (interval, _), state in states.items():
+            if interval != Client.KLINE_INTERVAL_1HOUR or kline['t'] != state['last_open_time'] + candle_ms:
+                continue  # Not the next candle (or already applied); get_bollinger_bands will catch up over REST
+            _roll_bollinger_window(state, close, kline['t'])
+            state['forming_close_time'] = kline['T'] + candle_ms
+
+async def _consume_kline_stream(socket_manager):
+    streams = [f"{symbol.lower()}@kline_{Client.KLINE_INTERVAL_1HOUR}" for symbol in _kline_stream_symbols()]
+    async with socket_manager.multiplex_socket(streams) as stream:
+        while True:
+            msg = await stream.recv()
+            if msg.get('e') == 'error':
+                raise ConnectionError(msg.get('m', 'kline stream error'))
+            if _kline_resubscribe:
+                # Candle updates arrive every few seconds, so a changed symbol set is picked up promptly;
+                # returning makes _run_stream_forever reconnect right away with the new streams
+                logger.info("Open-trade symbols changed; resubscribing the kline stream.")
+                return
+            kline = msg['data']['k']
+            if not kline['x']:  # Only closed candles
+                continue
+            if kline['s'] == "BTCUSDT":
+                _store_btc_hourly_close(kline['t'], float(kline['c']))
+            _fold_closed_candle(kline['s'], kline)
+            _fold_closed_candle_bollinger(kline['s'], kline)
+
+async def _run_stream_forever(name: str, consume, socket_manager):
+    """Keeps a websocket consumer running, reconnecting after failures (after 5s) or when it returns (at once)."""
+    while True:
+        try:
+            await consume(socket_manager)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"{name} stream disconnected: {e}. Reconnecting in 5s...")
+            await asyncio.sleep(5)
+
+async def start_background_tasks(application):
+    """Starts the notification sender and the market streams. Used as the Application's post_init hook."""
+    for _ in range(NOTIFICATION_WORKERS):
+        application.create_task(_notification_worker(application.bot))
+    restore_adaptive_parameters()
+    if client:
+        # The REST mirrors are timed in a worker thread once the bot is up, not when this module is imported
+        application.create_task(repin_binance_endpoint(None))
+        # Order placement then finds every symbol's filters already loaded
+        application.create_task(run_blocking(refresh_symbol_info))
+    await start_market_streams(application)
+
+async def start_market_streams(application):
+    """Starts the price and hourly candle websocket streams."""
+    global _stream_client
+    try:
+        _stream_client = await AsyncClient.create()
+    except Exception as e:
+        logger.error(f"Could not start Binance market streams, falling back to REST polling: {e}")
+        return
+    socket_manager = BinanceSocketManager(_stream_client)
+    application.create_task(_run_stream_forever("miniTicker", _consume_miniticker_stream, socket_manager))
+    application.create_task(_run_stream_forever("kline", _consume_kline_stream, socket_manager))
+    application.create_task(_reactive_monitor(application))
+    logger.info("Binance market streams started.")
+
+async def stop_market_streams(application):
+    """Closes the websocket client. Used as the Application's post_shutdown hook."""
+    global _stream_client
+    if _stream_client:
+        await _stream_client.close_connection()
+        _stream_client = None
+
+@ttl_cache(ttl=5)
 def get_current_price(symbol: str):
-    """Fetches the current price of a given symbol from Binance."""
+    """Fetches the current price of a given symbol, preferring the websocket stream over REST."""
+    price = get_streamed_price(symbol)
+    if price is not None:
+        return price
     try:
         ticker = client.get_symbol_ticker(symbol=symbol)
         return float(ticker['price'])
@@ -139,25 +564,312 @@ def get_current_price(symbol: str):
         logger.error(f"An unexpected error occurred getting price for {symbol}: {e}")
         return None
 
+# Largest `symbols` list for which /api/v3/ticker/price is cheaper than the unfiltered call
+TICKER_SYMBOLS_MAX = 100
+
+def get_prices(symbols):
+    """
+    Current prices for `symbols` as a symbol -> price dict. Streamed prices are used while
+    fresh; the rest come from one multi-symbol ticker request instead of one per symbol.
+    Symbols without a price are left out.
+    """
+    prices = {}
+    missing = []
+    for symbol in symbols:
+        price = get_streamed_price(symbol)
+        if price is None:
+            missing.append(symbol)
+        else:
+            prices[symbol] = price
+    if not missing:
+        return prices
+    try:
+        if len(missing) > TICKER_SYMBOLS_MAX:
+            # Past 100 symbols the filtered request costs more weight than the full ticker list
+            wanted = set(missing)
+            prices.update((t['symbol'], float(t['price'])) for t in client.get_all_tickers() if t['symbol'] in wanted)
+        else:
+            tickers = client.get_symbol_ticker(symbols=json.dumps(missing, separators=(',', ':')))
+            prices.update((t['symbol'], float(t['price'])) for t in tickers)
+    except BinanceAPIException as e:
+        # One unknown symbol (e.g. delisted) rejects the whole batch, so price the rest one at a time
+        logger.warning(f"Batch ticker request failed for {missing}, falling back to per-symbol requests: {e}")
+        for symbol in missing:
+            price = get_current_price(symbol)
+            if price is not None:
+                prices[symbol] = price
+    except Exception as e:
+        logger.error(f"An unexpected error occurred getting prices for {missing}: {e}")
+    return prices
+
+@ttl_cache(ttl=1)
+def get_all_prices():
+    """
+    Every ticker price as a symbol -> price dict. Served from the !miniTicker@arr stream
+    while it is fresh; otherwise fetched in a single REST request. Cached for a second so
+    callers within the same monitor tick share one snapshot.
+    """
+    if PRICE_CACHE and time.monotonic() - _price_cache_updated_at <= PRICE_STREAM_MAX_AGE_SECONDS:
+        return dict(PRICE_CACHE)
+    try:
+        return {t['symbol']: float(t['price']) for t in client.get_all_tickers()}
+    except BinanceAPIException as e:
+        logger.error(f"Binance API error fetching all tickers: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"An unexpected error occurred fetching all tickers: {e}")
+        return None
+
 def get_monitored_coins():
     return config.AI_MONITOR_COINS
 
-def get_rsi(symbol="BTCUSDT", interval=Client.KLINE_INTERVAL_1HOUR, period=14):
-    """Calculates the Relative Strength Index (RSI) for a given symbol."""
+# --- Async wrappers for the blocking Binance client ---
+# Caps how many REST calls run in worker threads at the same time.
+_binance_semaphore = asyncio.Semaphore(10)
+# Stay below Binance's 6000 request-weight/minute IP limit, leaving headroom for unmetered sync calls
+BINANCE_RATE_LIMIT = AsyncTokenBucket(rate=5000, per=60)
+
+# Request weight per call, keyed by function name; anything not listed costs 1
+BINANCE_WEIGHTS = {
+    'get_current_price': 2,
+    'get_rsi': 2,
+    'get_bollinger_bands': 2,
+    'get_macd': 2,
+    'fetch_closes': 2,
+    'fetch_seed_klines': 2,
+    'get_rsi_and_bollinger_bands': 4,
+    'get_micro_vwap': 2,
+    'get_bid_ask_volume_ratio': 2,
+    'get_mad': 2,
+    'get_klines': 2,
+    'get_symbol_ticker': 2,
+    'get_prices': 4,
+    'get_all_prices': 4,
+    'get_all_tickers': 4,
+    'get_account': 20,
+    'get_my_trades': 20,
+    'refresh_symbol_info': 20,
+    'get_account_balance': 20,
+    'get_all_spot_balances': 20,
+    'get_last_trade_from_binance': 20,
+    'place_buy_order': 3,
+    'place_sell_order': 1,
+}
+
+# In-flight calls to cached functions, keyed like their caches; concurrent callers share one
+_in_flight: dict[tuple, asyncio.Task] = {}
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Runs a blocking Binance call in a worker thread so the event loop stays responsive.
+    Identical concurrent calls to a cached function (e.g. get_rsi for a symbol several
+    trades hold) share one request instead of all missing the cache at once.
+    """
+    if not hasattr(func, 'cache_clear'):
+        return await _run_in_thread(func, *args, **kwargs)
+    key = (func, args, tuple(sorted(kwargs.items())))
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_run_in_thread(func, *args, **kwargs))
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # Shielded so one caller being cancelled doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+async def _run_in_thread(func, *args, **kwargs):
+    await BINANCE_RATE_LIMIT.acquire(BINANCE_WEIGHTS.get(getattr(func, '__name__', ''), 1))
+    async with _binance_semaphore:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+# Telegram allows about 30 messages per second per bot
+TELEGRAM_RATE_LIMIT = AsyncTokenBucket(rate=30, per=1)
+
+async def send_message_limited(bot, chat_id, text, parse_mode='Markdown'):
+    """Sends a Telegram message without exceeding the bot-wide send rate."""
+    async with TELEGRAM_RATE_LIMIT:
+        return await bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
+
+# Monitor notifications are queued here and sent by _notification_worker, so a scan never
+# waits on Telegram round trips or flood-control delays
+notification_queue: asyncio.Queue = asyncio.Queue()
+# Several senders keep a few Telegram requests in flight at once; the token bucket still caps the rate
+NOTIFICATION_WORKERS = 4
+
+def queue_notification(chat_id, text, description, parse_mode='Markdown'):
+    """Hands a Telegram message to the background sender."""
+    notification_queue.put_nowait((chat_id, text, parse_mode, description))
+
+# Telegram rejects messages longer than this many characters
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+def queue_notifications(chat_id, notifications, parse_mode='Markdown'):
+    """
+    Queues (text, description) pairs for one chat as few messages as Telegram's length
+    limit allows, so a burst of alerts for one user is one send instead of one per alert.
+    """
+    texts, descriptions, length = [], [], 0
+    for text, description in notifications:
+        if texts and length + 2 + len(text) > TELEGRAM_MESSAGE_LIMIT:
+            queue_notification(chat_id, "\n\n".join(texts), "; ".join(descriptions), parse_mode)
+            texts, descriptions, length = [], [], 0
+        length += len(text) + (2 if texts else 0)
+        texts.append(text)
+        descriptions.append(description)
+    if texts:
+        queue_notification(chat_id, "\n\n".join(texts), "; ".join(descriptions), parse_mode)
+
+async def _notification_worker(bot):
+    """Drains notification_queue at the bot-wide send rate, honouring Telegram's retry_after."""
+    while True:
+        chat_id, text, parse_mode, description = await notification_queue.get()
+        try:
+            await send_message_limited(bot, chat_id, text, parse_mode)
+            logger.info(f"Sent {description}")
+        except RetryAfter as e:
+            delay = e.retry_after.total_seconds() if isinstance(e.retry_after, timedelta) else e.retry_after
+            logger.warning(f"Telegram flood control while sending {description}; retrying in {delay}s")
+            await asyncio.sleep(delay)
+            notification_queue.put_nowait((chat_id, text, parse_mode, description))
+        except Exception as e:
+            logger.error(f"Failed to send {description}: {e}")
+        finally:
+            notification_queue.task_done()
+
+async def keep_binance_connection_warm(context: ContextTypes.DEFAULT_TYPE):
+    """Pings Binance periodically so the pooled keep-alive connection is not closed while idle."""
+    if not client:
+        return
     try:
-        # Fetch klines (candlestick data)
-        klines = client.get_historical_klines(symbol, interval, f"{period + 10} hours ago UTC")
-        if len(klines) < period:
-            return None # Not enough data
-
-        closes = np.array([float(k[4]) for k in klines])
-        deltas = np.diff(closes)
-        seed = deltas[:period+1]
-        up = seed[seed >= 0].sum()/period
-        down = -seed[seed < 0].sum()/period
-        rs = up / down if down != 0 else 0
-        rsi = 100 - (100 / (1 + rs))
+        await run_blocking(client.ping)
+    except Exception as e:
+        logger.warning(f"Binance keep-alive ping failed: {e}")
+
+async def repin_binance_endpoint(context: ContextTypes.DEFAULT_TYPE):
+    """Re-measures the Binance REST mirrors and moves existing clients to the fastest one."""
+    global _pinned_base_endpoint
+    endpoint = await asyncio.to_thread(_measure_fastest_base_endpoint)
+    if endpoint == _pinned_base_endpoint:
+        return
+    _pinned_base_endpoint = endpoint
+    api_url = Client.API_URL.format(endpoint, 'com')
+    with _user_clients_lock:
+        user_clients = [cached for _, cached in _user_clients.values()]
+    for binance_client in [client, *user_clients]:
+        if binance_client:
+            binance_client.API_URL = api_url
+    logger.info(f"Pinned Binance REST endpoint to {api_url}")
+
+async def aget_current_price(symbol: str):
+    """Async version of get_current_price."""
+    # A fresh streamed price is a dict read; only the REST fallback needs a worker thread and rate-limit tokens
+    price = get_streamed_price(symbol)
+    if price is not None:
+        return price
+    return await run_blocking(get_current_price, symbol)
+
+async def aget_rsi(symbol="BTCUSDT", interval=Client.KLINE_INTERVAL_1HOUR, period=14):
+    """Async version of get_rsi."""
+    # Between candle closes RSI is arithmetic on the stream; only a fetch needs a worker thread
+    rsi = _streamed_rsi(symbol, interval, period)
+    if rsi is not None:
         return rsi
+    return await run_blocking(get_rsi, symbol, interval, period)
+
+# Symbols come from user commands, so per-symbol state is kept in bounded maps
+INDICATOR_STATE_MAX_SYMBOLS = 1024
+
+# Wilder smoothing state per (symbol, interval, period), folded over closed candles only
+_rsi_state = ShadowMap(INDICATOR_STATE_MAX_SYMBOLS)
+# Held while reading or stepping an indicator state: the kline stream folds candles on the
+# event loop while worker threads catch up over REST, and a candle must be applied once
+_indicator_state_lock = threading.Lock()
+
+def _streamed_rsi(symbol, interval, period):
+    """
+    RSI from the stored Wilder state with the streamed price as the forming candle's close,
+    or None if no candle has closed since the state was built or there is no fresh price.
+    """
+    state = _rsi_state.get((symbol, interval, period))
+    if state is None:
+        return None
+    with _indicator_state_lock:
+        if not state['forming_close_time'] or time.time() * 1000 >= state['forming_close_time']:
+            return None
+        live_price = get_streamed_price(symbol)
+        if live_price is None:
+            return None
+        avg_gain, avg_loss = wilder_step(state['avg_gain'], state['avg_loss'], live_price - state['last_close'], period)
+    return float(rsi_from_averages(avg_gain, avg_loss))
+
+@ttl_cache(ttl=60, expires_in=until_candle_close)
+def get_rsi(symbol="BTCUSDT", interval=Client.KLINE_INTERVAL_1HOUR, period=14):
+    """
+    Calculates the Relative Strength Index (RSI) for a given symbol.
+    The first call per symbol seeds Wilder's averages from history; later calls
+    only fetch the latest two candles and fold in any newly closed one in O(1).
+    While no new candle has closed, the streamed price stands in for the forming
+    candle's close and no request is made at all.
+    """
+    try:
+        rsi = _streamed_rsi(symbol, interval, period)
+        if rsi is not None:
+            return rsi
+
+        key = (symbol, interval, period)
+        state = _rsi_state.get(key)
+        if state is not None:
+            # Latest closed candle plus the forming one
+            klines = client.get_klines(symbol=symbol, interval=interval, limit=2)
+            candle_ms = klines[0][6] - klines[0][0] + 1 if klines else 0
+            with _indicator_state_lock:
+                missed = not klines or klines[0][0] > state['last_open_time'] + candle_ms
+            if missed:
+                # Candles were missed (e.g. the bot was down), so the state can't be stepped forward
+                state = None
+        if state is None:
+            # Seed from a long history so Wilder's smoothing has converged rather than reporting the
+            # simple-average seed; up to 100 klines cost the same request weight as period + 2
+            if period + 2 <= INDICATOR_KLINES_LIMIT:
+                klines = fetch_seed_klines(symbol, interval)
+            else:
+                klines = client.get_klines(symbol=symbol, interval=interval, limit=period + 2)
+
+        now_ms = int(time.time() * 1000)
+        closed = [k for k in klines if k[6] < now_ms]
+        forming = klines[-1] if klines and klines[-1][6] >= now_ms else None
+
+        if state is None:
+            if len(closed) < period + 1:
+                return None # Not enough data
+            # NumPy parses the close-price strings itself; no per-element float() call
+            closes = np.fromiter((k[4] for k in closed), dtype=np.float64, count=len(closed))
+            avg_gain, avg_loss = wilder_averages(closes, period)
+            last_close = closes[-1]
+            _rsi_state[key] = {
+                'avg_gain': avg_gain, 'avg_loss': avg_loss, 'last_close': last_close, 'last_open_time': closed[-1][0],
+                'forming_close_time': forming[6] if forming is not None else None,
+            }
+        else:
+            # The stream may have folded some of these candles already; the check and the step
+            # are one critical section so each candle is applied exactly once
+            with _indicator_state_lock:
+                for k in closed:
+                    if k[0] <= state['last_open_time']:
+                        continue
+                    close = float(k[4])
+                    state['avg_gain'], state['avg_loss'] = wilder_step(state['avg_gain'], state['avg_loss'], close - state['last_close'], period)
+                    state['last_close'] = close
+                    state['last_open_time'] = k[0]
+                if forming is not None and forming[0] <= state['last_open_time']:
+                    forming = None  # The stream closed this candle while the request was in flight
+                else:
+                    state['forming_close_time'] = forming[6] if forming is not None else None
+                avg_gain, avg_loss, last_close = state['avg_gain'], state['avg_loss'], state['last_close']
+
+        if forming is not None:
+            # Provisional value including the still-open candle; not stored in the state
+            avg_gain, avg_loss = wilder_step(avg_gain, avg_loss, float(forming[4]) - last_close, period)
+        return float(rsi_from_averages(avg_gain, avg_loss))
     except BinanceAPIException as e:
         logger.error(f"Binance API error getting RSI for {symbol}: {e}")
         return None
@@ -165,97 +877,195 @@ def get_rsi(symbol="BTCUSDT", interval=Client.KLINE_INTERVAL_1HOUR, period=14):
         logger.error(f"An unexpected error occurred getting RSI for {symbol}: {e}")
         return None
 
-def get_bollinger_bands(symbol, interval=Client.KLINE_INTERVAL_1HOUR, period=20, std_dev=2):
-    """Calculates Bollinger Bands for a given symbol."""
-    try:
-        # Fetch more klines to ensure SMA calculation is accurate
-        klines = client.get_historical_klines(symbol, interval, f"{period + 50} hours ago UTC")
-        if len(klines) < period:
-            return None, None, None, None
-
-        closes = np.array([float(k[4]) for k in klines])
+# Enough candles for MACD (slow + signal + 50) with default settings
+INDICATOR_KLINES_LIMIT = 100
 
-        # Calculate SMA and Standard Deviation for the most recent `period`
-        sma = np.mean(closes[-period:])
-        std = np.std(closes[-period:])
+# Hourly closes barely move within a few minutes; RSI and Bollinger stay at 60s since
+# they fold in the streamed price without a request
+@ttl_cache(ttl=300, expires_in=until_candle_close)
+def fetch_closes(symbol, interval=Client.KLINE_INTERVAL_1HOUR, limit=INDICATOR_KLINES_LIMIT):
+    """
+    Close prices of the latest `limit` klines (the newest one still forming) as a read-only
+    float64 array. Indicators on the same symbol and interval share this one request.
+    """
+    klines = client.get_klines(symbol=symbol, interval=interval, limit=limit)
+    closes = np.fromiter((k[4] for k in klines), dtype=np.float64, count=len(klines))
+    closes.setflags(write=False)
+    return closes
+
+# Only long enough for back-to-back seeds: a stale copy could pass off a forming candle as closed
+@ttl_cache(ttl=5)
+def fetch_seed_klines(symbol, interval=Client.KLINE_INTERVAL_1HOUR):
+    """
+    The latest INDICATOR_KLINES_LIMIT klines, shared by the RSI and Bollinger seeds so a cold
+    symbol costs one request for both. Callers must not modify the returned list.
+    """
+    return client.get_klines(symbol=symbol, interval=interval, limit=INDICATOR_KLINES_LIMIT)
 
-        upper_band = sma + (std * std_dev)
-        lower_band = sma - (std * std_dev)
-        return upper_band, sma, lower_band, std
+def get_rsi_and_bollinger_bands(symbol, period=20, std_dev=2):
+    """
+    Hourly RSI and Bollinger Bands computed one after the other in the calling thread, so a
+    cold symbol seeds both from the same fetch_seed_klines request.
+    """
+    return get_rsi(symbol), get_bollinger_bands(symbol, period=period, std_dev=std_dev)
+
+# Rolling Bollinger windows as symbol -> {(interval, period): state}: the last period - 1
+# closed candles with their running sums, so a newly closed candle updates them in O(1).
+# Keyed by symbol so the kline stream finds a symbol's windows without scanning the map;
+# the inner dicts and states are only touched under _indicator_state_lock
+_bb_state = ShadowMap(INDICATOR_STATE_MAX_SYMBOLS)
+
+def _roll_bollinger_window(state, close, open_time):
+    oldest = state['window'][0]
+    state['window'].append(close)  # maxlen evicts `oldest`
+    x, y = close - state['shift'], oldest - state['shift']
+    state['sum'] += x - y
+    state['sum_sq'] += x * x - y * y
+    state['last_open_time'] = open_time
+
+@ttl_cache(ttl=60, expires_in=until_candle_close, cache_if=has_values)
+def get_bollinger_bands(symbol, interval=Client.KLINE_INTERVAL_1HOUR, period=20, std_dev=2):
+    """
+    Calculates Bollinger Bands for a given symbol over the last `period` candles, the
+    forming one included. Like get_rsi, the first call seeds a rolling window from history
+    and later calls only fold in newly closed candles, using the streamed price for the
+    forming candle while it is fresh.
+    """
+    try:
+        key = (interval, period)
+        states = _bb_state.setdefault(symbol, {})
+        forming_close = None
+        with _indicator_state_lock:
+            state = states.get(key)
+            if state and state['forming_close_time'] and time.time() * 1000 < state['forming_close_time']:
+                forming_close = get_streamed_price(symbol)
+                if forming_close is not None:
+                    sums = state['sum'], state['sum_sq'], state['shift']
+
+        if forming_close is None:
+            if state is not None:
+                # Latest closed candle plus the forming one
+                klines = client.get_klines(symbol=symbol, interval=interval, limit=2)
+                candle_ms = klines[0][6] - klines[0][0] + 1 if klines else 0
+                with _indicator_state_lock:
+                    missed = not klines or klines[0][0] > state['last_open_time'] + candle_ms
+                if missed:
+                    state = None  # Candles were missed, so the window can't be rolled forward
+            if state is None:
+                if period + 1 <= INDICATOR_KLINES_LIMIT:
+                    klines = fetch_seed_klines(symbol, interval)
+                else:
+                    klines = client.get_klines(symbol=symbol, interval=interval, limit=period + 1)
+
+            now_ms = int(time.time() * 1000)
+            closed = [k for k in klines if k[6] < now_ms]
+            forming = klines[-1] if klines and klines[-1][6] >= now_ms else None
+            if forming is None:
+                if not closed:
+                    return None, None, None, None
+                # No open candle (e.g. the request landed on a boundary): the last closed one stands in
+                forming, closed = closed[-1], closed[:-1]
+
+            if state is None:
+                if len(closed) < period - 1:
+                    return None, None, None, None
+                window = kline_column(closed[-(period - 1):], 4)
+                shift = window[-1]
+                shifted = window - shift
+                state = {
+                    'window': deque(window.tolist(), maxlen=period - 1), 'shift': shift,
+                    'sum': float(shifted.sum()), 'sum_sq': float(np.dot(shifted, shifted)),
+                    'last_open_time': closed[-1][0], 'forming_close_time': forming[6],
+                }
+                with _indicator_state_lock:
+                    states[key] = state
+                    sums = state['sum'], state['sum_sq'], state['shift']
+            else:
+                # The stream may have rolled some of these candles in already; checking and rolling
+                # under the lock applies each candle exactly once
+                with _indicator_state_lock:
+                    for k in closed:
+                        if k[0] > state['last_open_time']:
+                            _roll_bollinger_window(state, float(k[4]), k[0])
+                    sums = state['sum'], state['sum_sq'], state['shift']
+                    if forming[0] <= state['last_open_time']:
+                        # The stream closed this candle mid-request, so the window is already past it
+                        forming = None
+                    else:
+                        state['forming_close_time'] = forming[6]
+            forming_close = float(forming[4]) if forming is not None else get_streamed_price(symbol)
+            if forming_close is None:
+                return None, None, None, None
+
+        window_sum, window_sum_sq, shift = sums
+        x = forming_close - shift
+        upper_band, sma, lower_band, std = bollinger_from_sums(window_sum + x, window_sum_sq + x * x, period, std_dev, shift)
+        return float(upper_band), float(sma), float(lower_band), float(std)
     except Exception as e:
         logger.error(f"An unexpected error occurred getting Bollinger Bands for {symbol}: {e}")
         return None, None, None, None
 
+@ttl_cache(ttl=300, expires_in=until_candle_close, cache_if=has_values)
 def get_macd(symbol, interval=Client.KLINE_INTERVAL_1HOUR, fast_period=12, slow_period=26, signal_period=9):
     """Calculates the MACD for a given symbol."""
     try:
         # Fetch enough klines for the slow EMA + signal line
-        klines = client.get_historical_klines(symbol, interval, f"{slow_period + signal_period + 50} hours ago UTC")
-        if len(klines) < slow_period + signal_period:
+        closes = fetch_closes(symbol, interval, max(INDICATOR_KLINES_LIMIT, slow_period + signal_period + 50))
+        if len(closes) < slow_period + signal_period:
             return None, None, None
 
-        def get_micro_vwap(symbol, interval=Client.KLINE_INTERVAL_1MINUTE, window=20):
-            """Calculates Micro-VWAP (short-term VWAP) for a given symbol."""
-            try:
-                klines = client.get_historical_klines(symbol, interval, f"{window} minutes ago UTC")
-                if len(klines) < window:
-                    return None
-                prices = np.array([float(k[4]) for k in klines])
-                volumes = np.array([float(k[5]) for k in klines])
-                vwap = np.sum(prices * volumes) / np.sum(volumes)
-                return vwap
-            except Exception as e:
-                logger.error(f"Error calculating Micro-VWAP for {symbol}: {e}")
-                return None
-
-        def get_bid_ask_volume_ratio(symbol, interval=Client.KLINE_INTERVAL_1MINUTE, window=20):
-            """Estimates bid/ask volume ratio using kline buy/sell volume approximation."""
-            try:
-                klines = client.get_historical_klines(symbol, interval, f"{window} minutes ago UTC")
-                if len(klines) < window:
-                    return None
-                buy_volumes = np.array([float(k[9]) for k in klines])  # taker buy volume
-                total_volumes = np.array([float(k[5]) for k in klines])
-                sell_volumes = total_volumes - buy_volumes
-                ratio = np.sum(buy_volumes) / (np.sum(sell_volumes) + 1e-8)
-                return ratio
-            except Exception as e:
-                logger.error(f"Error calculating bid/ask volume ratio for {symbol}: {e}")
-                return None
-
-        def get_mad(symbol, interval=Client.KLINE_INTERVAL_1HOUR, window=20):
-            """Calculates Mean Absolute Deviation (MAD) for a given symbol."""
-            try:
-                klines = client.get_historical_klines(symbol, interval, f"{window} hours ago UTC")
-                if len(klines) < window:
-                    return None
-                closes = np.array([float(k[4]) for k in klines])
-                mean = np.mean(closes)
-                mad = np.mean(np.abs(closes - mean))
-                return mad
-            except Exception as e:
-                logger.error(f"Error calculating MAD for {symbol}: {e}")
-                return None
-        closes = pd.Series([float(k[4]) for k in klines])
-
-        # Calculate EMAs
-        ema_fast = closes.ewm(span=fast_period, adjust=False).mean()
-        ema_slow = closes.ewm(span=slow_period, adjust=False).mean()
-
-        # Calculate MACD line
-        macd_line = ema_fast - ema_slow
+        # MACD line, signal line and histogram, most recent values only
+        macd, signal, histogram = calc_macd(closes, fast_period, slow_period, signal_period)
+        return float(macd), float(signal), float(histogram)
+    except Exception as e:
+        logger.error(f"An unexpected error occurred getting MACD for {symbol}: {e}")
+        return None, None, None
 
-        # Calculate Signal line
-        signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+@ttl_cache(ttl=60)
+def get_micro_vwap(symbol, interval=Client.KLINE_INTERVAL_1MINUTE, window=20):
+    """Calculates Micro-VWAP (short-term VWAP) for a given symbol."""
+    try:
+        klines = client.get_klines(symbol=symbol, interval=interval, limit=window)
+        if len(klines) < window:
+            return None
+        prices = kline_column(klines, 4)
+        volumes = kline_column(klines, 5)
+        vwap = np.sum(prices * volumes) / np.sum(volumes)
+        return vwap
+    except Exception as e:
+        logger.error(f"Error calculating Micro-VWAP for {symbol}: {e}")
+        return None
 
-        # Calculate MACD Histogram
-        macd_histogram = macd_line - signal_line
+@ttl_cache(ttl=60)
+def get_bid_ask_volume_ratio(symbol, interval=Client.KLINE_INTERVAL_1MINUTE, window=20):
+    """Estimates bid/ask volume ratio using kline buy/sell volume approximation."""
+    try:
+        klines = client.get_klines(symbol=symbol, interval=interval, limit=window)
+        if len(klines) < window:
+            return None
+        buy_volumes = kline_column(klines, 9)  # taker buy volume
+        total_volumes = kline_column(klines, 5)
+        sell_volumes = total_volumes - buy_volumes
+        ratio = np.sum(buy_volumes) / (np.sum(sell_volumes) + 1e-8)
+        return ratio
+    except Exception as e:
+        logger.error(f"Error calculating bid/ask volume ratio for {symbol}: {e}")
+        return None
 
-        # Return the most recent values
-        return macd_line.iloc[-1], signal_line.iloc[-1], macd_histogram.iloc[-1]
+@ttl_cache(ttl=300, expires_in=until_candle_close)
+def get_mad(symbol, interval=Client.KLINE_INTERVAL_1HOUR, window=20):
+    """Calculates Mean Absolute Deviation (MAD) for a given symbol."""
+    try:
+        klines = client.get_klines(symbol=symbol, interval=interval, limit=window)
+        if len(klines) < window:
+            return None
+        closes = kline_column(klines, 4)
+        mean = np.mean(closes)
+        mad = np.mean(np.abs(closes - mean))
+        return mad
     except Exception as e:
-        logger.error(f"An unexpected error occurred getting MACD for {symbol}: {e}")
-        return None, None, None
+        logger.error(f"Error calculating MAD for {symbol}: {e}")
+        return None
 
 def get_account_balance(user_id: int, asset="USDT"):
     """Fetches the free balance for a specific asset from the Binance spot account."""
@@ -297,7 +1107,8 @@ def get_all_spot_balances(user_id: int) -> list[dict] | None:
         logger.warning(f"Cannot get spot balances for user {user_id}: client not available.")
         return None
     try:
-        account_info = user_client.get_account()
+        # Binance drops the hundreds of zero balances itself; the filter stays as a guard
+        account_info = user_client.get_account(omitZeroBalances='true')
         balances = [
             b for b in account_info.get('balances', [])
             if float(b['free']) > 0 or float(b['locked']) > 0
@@ -323,13 +1134,8 @@ def place_buy_order(user_id: int, symbol: str, usdt_amount: float, is_test=False
         raise TradeError(f"Could not retrieve trading rules for {symbol}.")
 
     # --- Validate Order against Filters (minNotional, stepSize) ---
-    min_notional = 0.0
-    step_size = 0.0
-    for f in info['filters']:
-        if f['filterType'] == 'NOTIONAL':
-            min_notional = float(f['minNotional'])
-        if f['filterType'] == 'LOT_SIZE':
-            step_size = float(f['stepSize'])
+    filters = info['filters_by_type']
+    min_notional = float(filters['NOTIONAL']['minNotional']) if 'NOTIONAL' in filters else 0.0
 
     if usdt_amount < min_notional:
         raise TradeError(f"Order value of ${usdt_amount:.2f} is below the minimum of ${min_notional:.2f} for {symbol}.")
@@ -375,9 +1181,7 @@ def place_sell_order(user_id: int, symbol: str, quantity: float):
         raise TradeError(f"Could not retrieve trading rules for {symbol} to sell.")
 
     # Format quantity according to the symbol's stepSize filter
-    step_size = float([f['stepSize'] for f in info['filters'] if f['filterType'] == 'LOT_SIZE'][0])
-    precision = int(round(-math.log(step_size, 10), 0))
-    formatted_quantity = f"{quantity:.{precision}f}"
+    formatted_quantity = f"{quantity:.{info.get('qty_precision', 8)}f}"
 
     try:
         logger.info(f"Attempting to SELL {formatted_quantity} of {symbol} for user {user_id}...")
@@ -407,17 +1211,29 @@ async def quest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     settings = db.get_user_effective_settings(user_id)
 
     # Check if a trade is already open or on the watchlist for this symbol
-    if db.is_trade_open(user_id, symbol):
+    symbol_status = db.get_symbol_status(user_id, symbol)
+    if symbol_status['open']:
         await update.message.reply_text(f"You already have an open quest for {symbol}. Use /status to see it.")
         return
 
-    if db.is_on_watchlist(user_id, symbol):
+    if symbol_status['watchlist']:
         await update.message.reply_text(f"You are already watching {symbol} for a dip. Use /status to check.")
         return
 
     await update.message.reply_text(f"Lunessa is gazing into the cosmic energies of {symbol}... 🔮")
-    price = get_current_price(symbol)
-    rsi = get_rsi(symbol)
+    is_premium_user = settings.get('USE_BOLLINGER_BANDS')
+    # RSI and Bollinger Bands share one klines fetch and run alongside the price lookup
+    if is_premium_user:
+        indicator_fetch = run_blocking(
+            get_rsi_and_bollinger_bands,
+            symbol,
+            period=settings.get('BOLL_PERIOD', 20),
+            std_dev=settings.get('BOLL_STD_DEV', 2)
+        )
+    else:
+        indicator_fetch = aget_rsi(symbol)
+    price, fetched = await asyncio.gather(aget_current_price(symbol), indicator_fetch)
+    rsi, *bands = fetched if is_premium_user else (fetched,)
 
     if price is not None and rsi is not None:
         message = (
@@ -428,14 +1244,9 @@ async def quest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # --- Premium Feature: Enhanced Buy Signal with Bollinger Bands ---
         is_bollinger_buy = False
-        is_premium_user = settings.get('USE_BOLLINGER_BANDS')
-        if settings.get('USE_BOLLINGER_BANDS'):
-            _, _, lower_band, _ = get_bollinger_bands(
-                symbol,
-                period=settings.get('BOLL_PERIOD', 20),
-                std_dev=settings.get('BOLL_STD_DEV', 2)
-            )
-            if lower_band:
+        if is_premium_user:
+            _, _, lower_band, _ = bands[0]
+            if lower_band is not None:
                 message += f"📊 **Lower Bollinger Band:** `${lower_band:,.8f}`\n\n"
                 if price <= lower_band:
                     is_bollinger_buy = True
@@ -490,61 +1301,68 @@ async def balance_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     await update.message.reply_text("Checking your treasure chest (Binance)...")
     try:
-        balance = get_account_balance(user_id, asset="USDT")
+        balance = await run_blocking(get_account_balance, user_id, asset="USDT")
         if balance is not None:
             await update.message.reply_text(f"You hold **{balance:.2f} USDT**.", parse_mode='Markdown')
     except TradeError as e:
         # This will now catch the specific error message from the API
         await update.message.reply_text(f"Could not retrieve your balance.\n\n*Reason:* `{e}`\n\nPlease check your API key permissions and IP restrictions on Binance.", parse_mode='Markdown')
 
+# The open-trade columns /status shows, read from a row in one call
+_status_trade_fields = itemgetter('coin_symbol', 'buy_price', 'quantity', 'id')
+# Wallet assets at or below this total are dust and left out of /status
+SIGNIFICANT_BALANCE = 0.00000001
+# Whether a wallet asset belongs to an open trade -> its /status label
+HOLDING_LABELS = {True: 'Open Trade', False: 'Core Holding'}
+
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handles the /status command, showing open trades and wallet holdings."""
     user_id = update.effective_user.id
     mode, paper_balance = db.get_user_trading_mode_and_balance(user_id)
 
-    message = f"✨ **Your Current Status ({mode} Mode)** ✨\n\n"
+    # Parts are joined once at the end rather than re-copying the message on every append
+    parts = [f"✨ **Your Current Status ({mode} Mode)** ✨\n\n"]
 
     # --- Display Open Trades ---
     open_trades = db.get_open_trades(user_id)
     if open_trades:
-        message += "📊 **Open Quests:**\n"
+        parts.append("📊 **Open Quests:**\n")
+        # One multi-symbol ticker request prices every quest instead of a request per trade
+        prices = await run_blocking(get_prices, sorted({t['coin_symbol'] for t in open_trades}))
         for trade_item in open_trades:
-            symbol = trade_item['coin_symbol']
-            buy_price = trade_item['buy_price']
-            quantity = trade_item['quantity']
-            trade_id = trade_item['id']
-            
+            symbol, buy_price, quantity, trade_id = _status_trade_fields(trade_item)
+
             # Attempt to get current price for P/L calculation
-            current_price = get_current_price(symbol)
+            current_price = prices.get(symbol) or await aget_current_price(symbol)
             pnl_text = ""
             if current_price:
                 pnl_percent = ((current_price - buy_price) / buy_price) * 100
                 pnl_text = f" (P/L: `{pnl_percent:+.2f}%`)"
             
-            message += (
+            parts.append(
                 f"- **{symbol}** (ID: {trade_id})\n"
                 f"  - Bought: `${buy_price:,.8f}`\n"
                 f"  - Qty: `{quantity:.4f}`{pnl_text}\n"
             )
-        message += "\n"
+        parts.append("\n")
     else:
-        message += "📊 **Open Quests:** None\n\n"
+        parts.append("📊 **Open Quests:** None\n\n")
 
     # --- Display Watchlist ---
     watchlist_items = db.get_all_watchlist_items_for_user(user_id)
     if watchlist_items:
-        message += "👀 **Watching for Dips:**\n"
+        parts.append("👀 **Watching for Dips:**\n")
         for item in watchlist_items:
-            message += f"- **{item['coin_symbol']}** (Added: {item['add_timestamp']})\n"
-        message += "\n"
+            parts.append(f"- **{item['coin_symbol']}** (Added: {item['add_timestamp']})\n")
+        parts.append("\n")
     else:
-        message += "👀 **Watching for Dips:** None\n\n"
+        parts.append("👀 **Watching for Dips:** None\n\n")
 
     # --- Display Wallet Holdings (Live Mode Only) ---
     if mode == 'LIVE':
-        message += "💰 **Wallet Holdings:**\n"
+        parts.append("💰 **Wallet Holdings:**\n")
         try:
-            wallet_balances = get_all_spot_balances(user_id)
+            wallet_balances = await run_blocking(get_all_spot_balances, user_id)
             if wallet_balances:
                 # Get symbols from open trades for differentiation
                 open_trade_symbols = {trade_item['coin_symbol'].replace('USDT', '') for trade_item in open_trades}
@@ -552,31 +1370,29 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 core_holdings_found = False
                 for bal in wallet_balances:
                     asset = bal['asset']
-                    free = float(bal['free'])
-                    locked = float(bal['locked'])
-                    total = free + locked
+                    total = float(bal['free']) + float(bal['locked'])
 
                     # Only show assets with a significant balance
-                    if total > 0.00000001:
-                        # Check if this asset is part of an open trade
-                        if asset in open_trade_symbols:
-                            message += f"- **{asset}:** `{total:.4f}` (Open Trade)\n"
-                        else:
-                            message += f"- **{asset}:** `{total:.4f}` (Core Holding)\n"
-                            core_holdings_found = True
+                    if total > SIGNIFICANT_BALANCE:
+                        in_open_trade = asset in open_trade_symbols
+                        parts.append(f"- **{asset}:** `{total:.4f}` ({HOLDING_LABELS[in_open_trade]})\n")
+                        core_holdings_found = core_holdings_found or not in_open_trade
                 if not core_holdings_found and not open_trades:
-                    message += "  No significant core holdings found.\n"
+                    parts.append("  No significant core holdings found.\n")
             else:
-                message += "  No assets found in your spot wallet.\n"
+                parts.append("  No assets found in your spot wallet.\n")
         except TradeError as e:
-            message += f"  *Could not retrieve wallet balances: {e.message}*\n"
+            parts.append(f"  *Could not retrieve wallet balances: {e.message}*\n")
         except Exception as e:
             logger.error(f"Unexpected error fetching wallet balances for status: {e}")
-            message += "  *An unexpected error occurred while fetching wallet balances.*\n"
+            parts.append("  *An unexpected error occurred while fetching wallet balances.*\n")
     elif mode == 'PAPER':
-        message += f"💰 **Paper Balance:** ${paper_balance:,.2f} USDT\n"
+        parts.append(f"💰 **Paper Balance:** ${paper_balance:,.2f} USDT\n")
 
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text("".join(parts), parse_mode='Markdown')
+
+# Trading pairs quoted in USDT or BTC, e.g. PEPEUSDT
+_SYMBOL_RE = re.compile(r"[A-Z0-9]+(?:USDT|BTC)\Z")
 
 async def import_last_trade_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handles the /import command to manually add a trade or import from Binance."""
@@ -602,12 +1418,12 @@ async def import_last_trade_command(update: Update, context: ContextTypes.DEFAUL
     quantity = None
 
     # Robust validation for symbol format and existence on Binance
-    if not re.fullmatch(r"[A-Z0-9]+(USDT|BTC)", symbol):
+    if not _SYMBOL_RE.match(symbol):
         await update.message.reply_text(f"Invalid symbol format: `{symbol}`. Please use a valid Binance trading pair like `BTCUSDT` or `ETHBTC`.", parse_mode='Markdown')
         return
 
     # Check if symbol exists on Binance
-    symbol_info = get_symbol_info(symbol)
+    symbol_info = await run_blocking(get_symbol_info, symbol)
     if not symbol_info:
         await update.message.reply_text(f"Symbol `{symbol}` does not exist on Binance or is not available for trading. Please check the symbol and try again.", parse_mode='Markdown')
         return
@@ -620,7 +1436,7 @@ async def import_last_trade_command(update: Update, context: ContextTypes.DEFAUL
                 quantity = float(context.args[2])
             else:
                 # If price is given but quantity is not, try to get it from Binance
-                last_trade = get_last_trade_from_binance(user_id, symbol)
+                last_trade = await run_blocking(get_last_trade_from_binance, user_id, symbol)
                 if last_trade and float(last_trade['price']) == buy_price:
                     quantity = float(last_trade['qty'])
                 else:
@@ -629,7 +1445,7 @@ async def import_last_trade_command(update: Update, context: ContextTypes.DEFAUL
         else:
             # Auto-import from Binance
             await update.message.reply_text(f"Attempting to import your last trade for {symbol} from Binance...")
-            last_trade = get_last_trade_from_binance(user_id, symbol)
+            last_trade = await run_blocking(get_last_trade_from_binance, user_id, symbol)
 
             if not last_trade:
                 await update.message.reply_text(f"Could not find a recent trade for {symbol} on Binance. Please specify the buy price and quantity manually: `/import {symbol} <PRICE> <QUANTITY>`.", parse_mode='Markdown')
@@ -642,8 +1458,8 @@ async def import_last_trade_command(update: Update, context: ContextTypes.DEFAUL
         if buy_price and quantity:
             # Calculate stop loss and take profit based on current settings
             settings = db.get_user_effective_settings(user_id)
-            stop_loss_price = buy_price * (1 - settings['STOP_LOSS_PERCENTAGE'] / 100)
-            take_profit_price = buy_price * (1 + settings['PROFIT_TARGET_PERCENTAGE'] / 100)
+            stop_loss_price = buy_price * settings['SL_MULT']
+            take_profit_price = buy_price * settings['TP_MULT']
 
             trade_id = db.log_trade(user_id=user_id, coin_symbol=symbol, buy_price=buy_price,
                                     stop_loss=stop_loss_price, take_profit=take_profit_price,
@@ -690,7 +1506,7 @@ async def close_trade_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     quantity = trade_to_close['quantity']
     mode = trade_to_close['mode']
 
-    current_price = get_current_price(symbol)
+    current_price = await aget_current_price(symbol)
     if not current_price:
         await update.message.reply_text(f"Could not get current price for {symbol}. Please try again.")
         return
@@ -706,7 +1522,7 @@ async def close_trade_command(update: Update, context: ContextTypes.DEFAULT_TYPE
             # Attempt to sell on Binance
             if quantity and quantity > 0:
                 await update.message.reply_text(f"Attempting to sell {quantity:.4f} of {symbol} on Binance...")
-                place_sell_order(user_id, symbol, quantity)
+                await run_blocking(place_sell_order, user_id, symbol, quantity)
                 db.close_trade(trade_id=trade_id, user_id=user_id, sell_price=current_price, close_reason=close_reason, win_loss=win_loss, pnl_percentage=pnl_percent)
                 update_daily_pl(profit_usdt, db)
                 await update.message.reply_text(
@@ -735,9 +1551,15 @@ async def close_trade_command(update: Update, context: ContextTypes.DEFAULT_TYPE
             await update.message.reply_text("An unexpected error occurred while trying to close the trade.")
 
     elif mode == 'PAPER':
-        success = db.close_trade(trade_id=trade_id, user_id=user_id, sell_price=current_price, close_reason=close_reason, win_loss=win_loss, pnl_percentage=pnl_percent)
+        trade_size_usdt = _trade_field(trade_to_close, 'trade_size_usdt')
+        if trade_size_usdt:
+            profit_usdt = (current_price - buy_price) * (trade_size_usdt / buy_price)
+        # Close and credit the paper balance with the profit/loss in one transaction
+        success = db.close_trades_bulk(
+            [(current_price, close_reason, win_loss, pnl_percent, symbol, trade_id, user_id)],
+            {trade_id: profit_usdt}
+        )
         if success:
-            db.update_paper_balance(user_id, profit_usdt) # Update paper balance with profit/loss
             await update.message.reply_text(
                 f"✅ **Paper Trade Closed!**\n\n"
                 f"Your **{symbol}** paper quest (ID: {trade_id}) was manually closed at `${current_price:,.8f}`.\n\n"
@@ -748,29 +1570,74 @@ async def close_trade_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         else:
             await update.message.reply_text(f"Failed to close paper trade {trade_id}.")
 
+# BTC market state, read every tick from module scope; bot_data and the kv table are only
+# written on transitions
+_market_state = {'state': None}
+
+def _set_market_state(context: ContextTypes.DEFAULT_TYPE, state: str):
+    _market_state['state'] = state
+    context.bot_data['market_state'] = state
+    db.set_kv('market_state', state)
+
+# Length of the hourly candles the BTC volatility check compares
+BTC_CANDLE_MS = interval_to_milliseconds(Client.KLINE_INTERVAL_1HOUR)
+
+def _store_btc_hourly_close(open_time, close):
+    """Records a closed BTC hourly candle unless one at least as new is already stored."""
+    if _btc_hourly_closes and open_time <= _btc_hourly_closes[-1][0]:
+        return
+    _btc_hourly_closes.append((open_time, close))
+
+def _streamed_btc_hourly_closes():
+    """
+    (older close, newer close) of the last two closed BTC hourly candles if the stored pair is
+    exactly those two candles, else None: a stalled stream or a missed candle means REST.
+    """
+    if len(_btc_hourly_closes) < 2:
+        return None
+    (old_open, old_close), (new_open, new_close) = _btc_hourly_closes
+    now_ms = int(time.time() * 1000)
+    last_closed_open = now_ms - now_ms % BTC_CANDLE_MS - BTC_CANDLE_MS
+    if new_open != last_closed_open or old_open != new_open - BTC_CANDLE_MS:
+        return None
+    return old_close, new_close
+
 async def check_btc_volatility_and_alert(context: ContextTypes.DEFAULT_TYPE):
     """
     Checks BTC's recent price movement and sends an alert if it's significant.
     This helps users understand the overall market pressure.
     """
     try:
-        # Fetch the last 2 closed hourly candles for BTC
-        klines = client.get_historical_klines("BTCUSDT", Client.KLINE_INTERVAL_1HOUR, "2 hours ago UTC")
-        if len(klines) < 2:
-            logger.warning("Not enough BTC kline data to check for volatility.")
-            return
+        # Closes of the last two closed candles, maintained by the kline stream
+        streamed = _streamed_btc_hourly_closes()
+        if streamed:
+            old_price, new_price = streamed
+        else:
+            # Fetch the last 2 closed hourly candles for BTC
+            # The last kline is normally the forming candle; the two closed ones before it are used
+            klines = await run_blocking(client.get_klines, symbol="BTCUSDT", interval=Client.KLINE_INTERVAL_1HOUR, limit=3)
+            now_ms = int(time.time() * 1000)
+            closed = [k for k in klines if k[6] < now_ms]
+            if len(closed) < 2:
+                logger.warning("Not enough BTC kline data to check for volatility.")
+                return
 
-        # klines[0] is the older candle, klines[1] is the most recent closed candle
-        old_price = float(klines[0][4])  # Close price of the n-2 candle
-        new_price = float(klines[1][4])  # Close price of the n-1 candle
+            # closed[-2] is the older candle, closed[-1] is the most recent closed candle
+            old_price = float(closed[-2][4])  # Close price of the n-2 candle
+            new_price = float(closed[-1][4])  # Close price of the n-1 candle
+            if _stream_client:
+                # Seed the stream's window so later ticks need no request; a candle the stream
+                # already stored (or stores later) is not added twice
+                for k in closed[-2:]:
+                    _store_btc_hourly_close(k[0], float(k[4]))
 
         percent_change = ((new_price - old_price) / old_price) * 100
 
-        # Initialize bot_data for state management if it doesn't exist
-        if 'market_state' not in context.bot_data:
-            context.bot_data['market_state'] = 'CALM'
+        if _market_state['state'] is None:
+            # Restore the state from before a restart so the same alert is not sent twice
+            _market_state['state'] = db.get_kv('market_state', 'CALM')
 
-        last_state = context.bot_data.get('market_state', 'CALM')
+        last_state = _market_state['state']
         current_state = 'CALM'
         alert_message = None
 
@@ -802,11 +1669,11 @@ async def check_btc_volatility_and_alert(context: ContextTypes.DEFAULT_TYPE):
             try:
                 await context.bot.send_message(chat_id=config.CHAT_ID, text=alert_message, parse_mode='Markdown')
                 logger.info(f"Sent market alert to CHAT_ID {config.CHAT_ID}. New state: {current_state}")
-                context.bot_data['market_state'] = current_state
+                _set_market_state(context, current_state)
             except Exception as e:
                 logger.error(f"Failed to send market alert to CHAT_ID {config.CHAT_ID}: {e}")
         elif current_state != last_state:
-            context.bot_data['market_state'] = current_state
+            _set_market_state(context, current_state)
 
     except BinanceAPIException as e:
         logger.error(f"Binance API error during market volatility check: {e}")
@@ -821,39 +1688,34 @@ async def check_watchlist_for_buys(context: ContextTypes.DEFAULT_TYPE, prices: d
 
     logger.info(f"Checking {len(watchlist_items)} item(s) on the watchlist for dip-buy opportunities...")
 
-    now = datetime.now(timezone.utc)
+    now = time.time()
+    watchlist_timeout = config.WATCHLIST_TIMEOUT_HOURS * 3600
 
+    # Fetch RSI concurrently for every watched symbol not already cached; items past the
+    # timeout are removed below without looking at RSI, so they don't need it
+    live_symbols = {item['coin_symbol'] for item in watchlist_items if now - item['add_ts_epoch'] <= watchlist_timeout}
+    missing = list(live_symbols - indicator_cache.keys())
+    rsis = await asyncio.gather(*(aget_rsi(symbol) for symbol in missing))
+    for symbol, rsi in zip(missing, rsis):
+        indicator_cache[symbol] = {'rsi': rsi}
+
+    settings_by_user = db.get_effective_settings_bulk({item['user_id'] for item in watchlist_items})
+    # Buys stay sequential; the Telegram messages about them go to the notification worker
     for item in watchlist_items:
         symbol = item['coin_symbol']
         item_id = item['id']
         user_id = item['user_id']
-        settings = db.get_user_effective_settings(user_id)
+        settings = settings_by_user[user_id]
 
         # Check for timeout
-        add_time = datetime.strptime(item['add_timestamp'], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
-        hours_passed = (now - add_time).total_seconds() / 3600
-        if hours_passed > config.WATCHLIST_TIMEOUT_HOURS:
+        if now - item['add_ts_epoch'] > watchlist_timeout:
             db.remove_from_watchlist(item_id)
             logger.info(f"Removed {symbol} from watchlist for user {user_id} due to timeout.")
-            try:
-                await context.bot.send_message(
-                    chat_id=user_id,
-                    text=f"⏳ Your watch on **{symbol}** has expired without a buy signal. The opportunity has passed for now.",
-                    parse_mode='Markdown'
-                )
-            except Exception as e:
-                logger.error(f"Failed to send watchlist timeout notification to user {user_id}: {e}")
+            text = f"⏳ Your watch on **{symbol}** has expired without a buy signal. The opportunity has passed for now."
+            queue_notification(user_id, text, f"watchlist timeout notification to user {user_id}")
             continue
 
         # Check for buy signal (RSI recovery)
-        if symbol not in indicator_cache:
-            try:
-                indicator_cache[symbol] = {'rsi': get_rsi(symbol)}
-                time.sleep(0.1) # Stagger API calls to be safe
-            except BinanceAPIException as e:
-                logger.warning(f"API error getting RSI for watchlist item {symbol}: {e}")
-                continue
-
         cached_data = indicator_cache.get(symbol, {})
         current_rsi = cached_data.get('rsi')
 
@@ -867,7 +1729,7 @@ async def check_watchlist_for_buys(context: ContextTypes.DEFAULT_TYPE, prices: d
             mode, paper_balance = db.get_user_trading_mode_and_balance(user_id)
 
             # --- Risk Management: Pause trading if daily drawdown exceeded ---
-            account_balance = get_account_balance(user_id, 'USDT')
+            account_balance = await run_blocking(get_account_balance, user_id, 'USDT')
             if should_pause_trading(db, account_balance, getattr(config, 'MAX_DAILY_DRAWDOWN_PERCENT', 0.10)):
                 logger.info(f"Trading paused for user {user_id} due to daily drawdown limit.")
                 continue
@@ -881,13 +1743,13 @@ async def check_watchlist_for_buys(context: ContextTypes.DEFAULT_TYPE, prices: d
                 trade_size_usdt = get_trade_size(usdt_balance, getattr(config, 'MIN_TRADE_SIZE_USDT', 5.0), getattr(config, 'TRADE_RISK_PERCENT', 0.05))
 
                 # --- ATR-based stop-loss ---
-                klines = client.get_historical_klines(symbol, Client.KLINE_INTERVAL_1HOUR, "30 hours ago UTC")
+                klines = await run_blocking(client.get_klines, symbol=symbol, interval=Client.KLINE_INTERVAL_1HOUR, limit=30)
                 atr = calc_atr(klines, period=14) if klines else None
 
                 try:
-                    order, entry_price, quantity = place_buy_order(user_id, symbol, trade_size_usdt)
-                    stop_loss_price = get_atr_stop(entry_price, atr, getattr(config, 'ATR_STOP_MULTIPLIER', 1.5)) if atr else entry_price * (1 - settings['STOP_LOSS_PERCENTAGE'] / 100)
-                    take_profit_price = entry_price * (1 + settings['PROFIT_TARGET_PERCENTAGE'] / 100)
+                    order, entry_price, quantity = await run_blocking(place_buy_order, user_id, symbol, trade_size_usdt)
+                    stop_loss_price = get_atr_stop(entry_price, atr, getattr(config, 'ATR_STOP_MULTIPLIER', 1.5)) if atr else entry_price * settings['SL_MULT']
+                    take_profit_price = entry_price * settings['TP_MULT']
                     db.log_trade(user_id=user_id, coin_symbol=symbol, buy_price=entry_price,
                                  stop_loss=stop_loss_price, take_profit=take_profit_price,
                                  mode='LIVE', quantity=quantity, rsi_at_buy=current_rsi)
@@ -902,11 +1764,10 @@ async def check_watchlist_for_buys(context: ContextTypes.DEFAULT_TYPE, prices: d
                         f"   - 🛡️ Stop Loss: `${stop_loss_price:,.8f}`\n\n"
                         f"Use /status to see your open quests."
                     )
-                    await context.bot.send_message(chat_id=user_id, text=message, parse_mode='Markdown')
+                    queue_notification(user_id, message, f"LIVE dip-buy notification for {symbol} to user {user_id}")
                 except TradeError as e:
-                    await context.bot.send_message(
-                        chat_id=user_id, text=f"⚠️ **Live Buy FAILED** for {symbol}.\n\n*Reason:* `{e}`\n\nPlease check your account balance and API key permissions.", parse_mode='Markdown'
-                    )
+                    text = f"⚠️ **Live Buy FAILED** for {symbol}.\n\n*Reason:* `{e}`\n\nPlease check your account balance and API key permissions."
+                    queue_notification(user_id, text, f"LIVE dip-buy failure notice for {symbol} to user {user_id}")
 
             elif mode == 'PAPER':
                 trade_size_usdt = config.PAPER_TRADE_SIZE_USDT
@@ -917,8 +1778,8 @@ async def check_watchlist_for_buys(context: ContextTypes.DEFAULT_TYPE, prices: d
                 db.update_paper_balance(user_id, -trade_size_usdt)
                 
                 entry_price = buy_price
-                stop_loss_price = entry_price * (1 - settings['STOP_LOSS_PERCENTAGE'] / 100)
-                take_profit_price = entry_price * (1 + settings['PROFIT_TARGET_PERCENTAGE'] / 100)
+                stop_loss_price = entry_price * settings['SL_MULT']
+                take_profit_price = entry_price * settings['TP_MULT']
                 db.log_trade(user_id=user_id, coin_symbol=symbol, buy_price=entry_price,
                              stop_loss=stop_loss_price, take_profit=take_profit_price,
                              mode='PAPER', trade_size_usdt=trade_size_usdt)
@@ -933,29 +1794,54 @@ async def check_watchlist_for_buys(context: ContextTypes.DEFAULT_TYPE, prices: d
                     f"   - 🛡️ Stop Loss: `${stop_loss_price:,.8f}`\n\n"
                     f"Use /status to see your open quests."
                 )
-                await context.bot.send_message(chat_id=user_id, text=message, parse_mode='Markdown')
+                queue_notification(user_id, message, f"PAPER dip-buy notification for {symbol} to user {user_id}")
 
 async def ai_trade_monitor(context: ContextTypes.DEFAULT_TYPE, prices: dict, indicator_cache: dict):
     """The core AI logic to automatically open trades based on market signals."""
     logger.info("AI trade monitor is running...")
+    user_id = config.ADMIN_USER_ID
+    if not user_id or not db.get_autotrade_status(user_id):
+        return
     # Market crash/big buyer shield
     if is_market_crash_or_big_buyer(prices):
         logger.warning("Trading paused due to market crash or big buyer activity.")
         return
-    user_id = config.ADMIN_USER_ID
-    if not user_id or not db.get_autotrade_status(user_id):
+
+    monitored_coins = getattr(config, "AI_MONITOR_COINS", [])
+    candidates = []
+    # Open trades and watchlist entries are read once for the scan instead of twice per coin
+    active_symbols = db.get_active_symbols(user_id)
+    for symbol in monitored_coins:
+        if symbol in active_symbols:
+            logger.info(f"Skipping {symbol}: Already open or on watchlist.")
+            continue
+        candidates.append(symbol)
+    if not candidates:
         return
+    # `prices` covers the open trades; candidates are priced from the miniTicker stream, with
+    # one batched ticker request for any the stream hasn't delivered
+    unpriced = [symbol for symbol in candidates if symbol not in prices]
+    if unpriced:
+        prices = {**prices, **await run_blocking(get_prices, unpriced)}
 
     # --- Layer 1: Market Weather Filter ---
-    def get_market_sentiment():
+    async def get_market_sentiment():
         try:
-            klines = client.get_historical_klines("BTCUSDT", Client.KLINE_INTERVAL_1DAY, "60 days ago UTC")
-            if len(klines) < 50:
+            # The 49 closed daily candles only change at the UTC day boundary, so they are
+            # fetched once per day; the forming candle is the live BTC price
+            today = datetime.now(timezone.utc).date()
+            cached = context.bot_data.get('btc_daily_closes')
+            if not cached or cached['date'] != today:
+                closes = await run_blocking(fetch_closes, "BTCUSDT", Client.KLINE_INTERVAL_1DAY, 50)
+                # The closed candles' sum is kept with them, so each cycle's MA50 is one addition
+                cached = context.bot_data['btc_daily_closes'] = {
+                    'date': today, 'closes': closes, 'closed_sum': float(closes[:-1].sum())}
+            closes = cached['closes']
+            if len(closes) < 50:
                 logger.warning("Not enough BTC kline data for market sentiment. Defaulting to BULLISH.")
                 return "BULLISH"
-            closes = [float(k[4]) for k in klines[-50:]]
-            btc_price = closes[-1]
-            btc_ma_50 = sum(closes) / len(closes)
+            btc_price = prices.get('BTCUSDT') or get_streamed_price('BTCUSDT') or closes[-1]
+            btc_ma_50 = (cached['closed_sum'] + btc_price) / 50
             if btc_price > btc_ma_50:
                 logger.info(f"Market Sentiment: BULLISH (BTC {btc_price:.2f} > MA50 {btc_ma_50:.2f})")
                 return "BULLISH"
@@ -966,59 +1852,56 @@ async def ai_trade_monitor(context: ContextTypes.DEFAULT_TYPE, prices: dict, ind
             logger.error(f"Error getting market sentiment: {e}. Defaulting to BULLISH.")
             return "BULLISH"
 
-    market_sentiment = get_market_sentiment()
+    market_sentiment = await get_market_sentiment()
     if market_sentiment == "BEARISH":
         logger.info("Pausing new buys: Market sentiment is BEARISH")
         return
 
     settings = db.get_user_effective_settings(user_id)
-    monitored_coins = getattr(config, "AI_MONITOR_COINS", [])
-
-    for symbol in monitored_coins:
-        if db.is_trade_open(user_id, symbol) or db.is_on_watchlist(user_id, symbol):
-            logger.info(f"Skipping {symbol}: Already open or on watchlist.")
-            continue
-
-        if symbol not in indicator_cache:
-            rsi = None
-            upper = None
-            lower = None
-            macd = None
-            macd_signal = None
-            try:
-                rsi = get_rsi(symbol)
-                upper, _, lower, _ = get_bollinger_bands(symbol)
-                macd, macd_signal, _ = get_macd(symbol)
-                indicator_cache[symbol] = {'rsi': rsi, 'bbands': (upper, _, lower, _), 'macd': macd, 'macd_signal': macd_signal}
-                time.sleep(0.2) # Stagger API calls
-            except Exception as e:
-                logger.error(f"Error fetching indicators for {symbol} in AI monitor: {e}")
-                continue
-        cached_data = indicator_cache.get(symbol, {})
-        rsi = cached_data.get('rsi')
-        lower_band = cached_data.get('bbands', (None, None, None, None))[2]
-        current_price = prices.get(symbol)
-        macd = cached_data.get('macd')
-        macd_signal = cached_data.get('macd_signal') if 'macd_signal' in cached_data else None
-        if rsi is None or lower_band is None or current_price is None or macd is None or macd_signal is None:
-            logger.info(f"Skipping {symbol}: Missing indicator data.")
-            continue
-
-        rsi_is_low = rsi < settings['RSI_BUY_THRESHOLD']
-        macd_bullish = macd > macd_signal
-        price_below_lower_band = current_price < lower_band
-
-        if not rsi_is_low:
-            logger.info(f"Skipping {symbol}: RSI {rsi:.2f} not below {settings['RSI_BUY_THRESHOLD']}")
-            continue
-        if not macd_bullish:
-            logger.info(f"Skipping {symbol}: MACD {macd:.4f} not above Signal {macd_signal:.4f}")
-            continue
-        if not price_below_lower_band:
-            logger.info(f"Skipping {symbol}: Price {current_price:.4f} not below lower band {lower_band:.4f}")
-            continue
-
-        usdt_balance = get_account_balance(user_id, 'USDT')
+    rsi_buy_threshold = settings['RSI_BUY_THRESHOLD']
+
+    # Closes for every candidate are fetched concurrently (sharing get_macd's cache), then
+    # RSI, Bollinger Bands and MACD for all of them come out of one batched kernel call
+    pending = [symbol for symbol in candidates if 'macd' not in indicator_cache.get(symbol, {})]
+    results = await asyncio.gather(*(run_blocking(fetch_closes, symbol) for symbol in pending),
+                                   return_exceptions=True)
+    batch_symbols, rows = [], []
+    for symbol, closes in zip(pending, results):
+        if isinstance(closes, Exception):
+            logger.error(f"Error fetching indicators for {symbol} in AI monitor: {closes}")
+        elif closes is not None and len(closes) == INDICATOR_KLINES_LIMIT:
+            row = closes.copy()
+            row[-1] = prices.get(symbol) or row[-1]  # the forming candle tracks the streamed price
+            batch_symbols.append(symbol)
+            rows.append(row)
+    if rows:
+        rsi_values, upper, middle, lower, std, macd_values, signal_values = batch_indicators(np.stack(rows))
+        for i, symbol in enumerate(batch_symbols):
+            cached_data = indicator_cache.setdefault(symbol, {})
+            # RSI may already be cached for this tick by the trade or watchlist checks
+            cached_data.setdefault('rsi', float(rsi_values[i]))
+            cached_data.update({'bbands': (float(upper[i]), float(middle[i]), float(lower[i]), float(std[i])),
+                                'macd': float(macd_values[i]), 'macd_signal': float(signal_values[i])})
+
+    # The entry conditions are checked for all candidates at once over float64 columns;
+    # missing indicator data becomes NaN, which fails every comparison
+    cached = [indicator_cache.get(symbol, {}) for symbol in candidates]
+    signals = np.array([(data.get('rsi'), data.get('bbands', (None, None, None, None))[2], prices.get(symbol),
+                         data.get('macd'), data.get('macd_signal'))
+                        for symbol, data in zip(candidates, cached)], dtype=np.float64)
+    rsi_col, lower_col, price_col, macd_col, signal_col = signals.T
+    buy_signal = (rsi_col < rsi_buy_threshold) & (macd_col > signal_col) & (price_col < lower_col)
+    missing = [symbol for symbol, incomplete in zip(candidates, np.isnan(signals).any(axis=1)) if incomplete]
+    if missing:
+        logger.info(f"Skipping {', '.join(missing)}: Missing indicator data.")
+    logger.info(f"{int(buy_signal.sum())} of {len(candidates)} candidate(s) have RSI below {rsi_buy_threshold}, "
+                f"MACD above signal and price below the lower band.")
+
+    for i in np.flatnonzero(buy_signal):
+        symbol = candidates[i]
+        rsi, lower_band, current_price, macd, macd_signal = signals[i].tolist()
+
+        usdt_balance = await run_blocking(get_account_balance, user_id, 'USDT')
         if usdt_balance is None or usdt_balance < 5:
             logger.info(f"Skipping {symbol}: USDT balance {usdt_balance} too low.")
             continue
@@ -1031,9 +1914,9 @@ async def ai_trade_monitor(context: ContextTypes.DEFAULT_TYPE, prices: dict, ind
             trade_size_usdt = usdt_balance
 
         try:
-            order, entry_price, quantity = place_buy_order(user_id, symbol, trade_size_usdt)
-            stop_loss_price = entry_price * (1 - settings['STOP_LOSS_PERCENTAGE'] / 100)
-            take_profit_price = entry_price * (1 + settings['PROFIT_TARGET_PERCENTAGE'] / 100)
+            order, entry_price, quantity = await run_blocking(place_buy_order, user_id, symbol, trade_size_usdt)
+            stop_loss_price = entry_price * settings['SL_MULT']
+            take_profit_price = entry_price * settings['TP_MULT']
             db.log_trade(user_id=user_id, coin_symbol=symbol, buy_price=entry_price,
                          stop_loss=stop_loss_price, take_profit=take_profit_price,
                          mode='LIVE', quantity=quantity, rsi_at_buy=rsi, highest_price=entry_price)
@@ -1046,14 +1929,62 @@ async def ai_trade_monitor(context: ContextTypes.DEFAULT_TYPE, prices: dict, ind
                 f"   - Strategy: RSI ({rsi:.2f}), MACD ({macd:.4f} > {macd_signal:.4f}), Price < Lower BB\n\n"
                 f"Use /status to monitor this new quest."
             )
-            await context.bot.send_message(chat_id=user_id, text=message, parse_mode='Markdown')
+            # Sent by the background sender at the bot-wide rate, so a 429 doesn't stall the scan
+            queue_notification(user_id, message, f"AI autotrade buy notification for {symbol}")
 
         except TradeError as e:
             logger.error(f"AI failed to execute buy for {symbol}: {e}")
-            await context.bot.send_message(chat_id=user_id, text=f"⚠️ **AI Autotrade FAILED** for {symbol}.\n*Reason:* `{e}`", parse_mode='Markdown')
+            queue_notification(user_id, f"⚠️ **AI Autotrade FAILED** for {symbol}.\n*Reason:* `{e}`", f"AI autotrade failure notification for {symbol}")
         except Exception as e:
             logger.error(f"An unexpected error occurred in AI trade execution for {symbol}: {e}", exc_info=True)
 
+def _alerted_sets(context: ContextTypes.DEFAULT_TYPE) -> dict:
+    """
+    Trade ids with an outstanding alert, by kind ('near_sl', 'near_tp'). Near-SL ids are
+    restored from the kv table after a restart so the same warning isn't sent twice.
+    """
+    alerted = context.bot_data.get('alerted')
+    if alerted is None:
+        stored = db.get_kv('near_sl_alerted')
+        alerted = context.bot_data['alerted'] = {
+            'near_sl': set(json.loads(stored)) if stored else set(),
+            'near_tp': set(),
+        }
+    return alerted
+
+def _trade_field(trade, key):
+    """A trade column that may be absent; works for both dicts and sqlite3.Row."""
+    return trade[key] if key in trade.keys() else None
+
+async def _fetch_recent_fills(trades) -> dict:
+    """
+    Binance fills for the LIVE `trades`, keyed by (user_id, symbol). myTrades needs a symbol,
+    so there is one request per user and symbol, starting at the earliest buy among that
+    user's trades in it; the requests run concurrently. Failed lookups are logged and left out.
+    """
+    start_ms = {}
+    for trade in trades:
+        ms = trade['buy_ts_ms']
+        if trade['mode'] == 'LIVE' and ms:
+            key = (trade['user_id'], trade['coin_symbol'])
+            start_ms[key] = min(ms, start_ms.get(key, ms))
+
+    async def fetch(user_id, symbol, start_time_ms):
+        # Building a client on a cache miss pings Binance, so it runs off the event loop
+        user_client = await run_blocking(get_user_client, user_id)
+        if not user_client:
+            return None
+        try:
+            return await run_blocking(user_client.get_my_trades, symbol=symbol, startTime=start_time_ms)
+        except BinanceAPIException as e:
+            logger.error(f"Binance API error during trade sync for user {user_id}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error during trade sync for user {user_id}: {e}")
+        return None
+
+    results = await asyncio.gather(*(fetch(user_id, symbol, ms) for (user_id, symbol), ms in start_ms.items()))
+    return {key: result for key, result in zip(start_ms, results) if result is not None}
+
 async def run_monitoring_cycle(context: ContextTypes.DEFAULT_TYPE, open_trades, prices, indicator_cache):
     """
     The intelligent core of the bot. Called by the JobQueue to:
@@ -1069,85 +2000,127 @@ async def run_monitoring_cycle(context: ContextTypes.DEFAULT_TYPE, open_trades,
     # Guard clause: handle empty open_trades
     if not open_trades:
         logger.info("No open trades to monitor. Checking for new trade opportunities.")
-        await ai_trade_monitor(context)
+        await ai_trade_monitor(context, prices, indicator_cache)
         return
 
-    logger.info(f"Monitoring {len(open_trades)} open trade(s)...")
-    now = datetime.now(timezone.utc)
+    # Trades are grouped by symbol so only those on a symbol priced this run are scanned;
+    # stream-triggered runs price just the symbols that crossed a level
+    trades_by_symbol = defaultdict(list)
     for trade in open_trades:
-        # Use .get for dicts, fallback for missing keys
-        mode = trade.get('mode') if hasattr(trade, 'get') else trade['mode'] if 'mode' in trade else None
-        buy_ts = trade.get('buy_timestamp') if hasattr(trade, 'get') else trade['buy_timestamp'] if 'buy_timestamp' in trade else None
-        user_id = trade.get('user_id') if hasattr(trade, 'get') else trade['user_id'] if 'user_id' in trade else None
-        symbol = trade.get('coin_symbol') if hasattr(trade, 'get') else trade['coin_symbol'] if 'coin_symbol' in trade else None
-        if not symbol or symbol not in prices:
-            continue
-        current_price = prices[symbol]
-        pnl_percent = ((current_price - trade['buy_price']) / trade['buy_price']) * 100 if 'buy_price' in trade else 0
-        held_hours = None
-        if buy_ts:
-            try:
-                buy_timestamp_dt = datetime.strptime(buy_ts, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
-                held_hours = (now - buy_timestamp_dt).total_seconds() / 3600
-            except (ValueError, TypeError):
-                held_hours = None
+        trades_by_symbol[trade['coin_symbol']].append(trade)
+    # Closed trades can't be alerted again, so their ids are dropped from the alert sets below
+    open_ids = {trade['id'] for trade in open_trades}
+    open_trades = [trade for symbol in prices.keys() & trades_by_symbol.keys() for trade in trades_by_symbol[symbol]]
+    if not open_trades:
+        logger.warning("No price data for any open trade; skipping this monitoring cycle.")
+        return
+
+    logger.info(f"Monitoring {len(open_trades)} open trade(s)...")
+    # One UTC date for the whole cycle's daily P/L updates
+    today = datetime.now(timezone.utc).date().isoformat()
+    # Effective settings are read once for all users rather than once per trade
+    user_ids = {trade['user_id'] for trade in open_trades}
+    settings_by_user = db.get_effective_settings_bulk(user_id for user_id in user_ids if user_id is not None)
+    if None in user_ids:
+        # Trades without an owner get the default settings, resolved here rather than per trade
         try:
-            settings = db.get_user_effective_settings(user_id)
+            settings_by_user[None] = db.get_user_effective_settings(None)
         except IndexError:
-            logger.error(f"No settings found for user_id {user_id}, using default settings.")
-            settings = db.get_user_effective_settings(None)
+            logger.error("No settings found for user_id None, using default settings.")
+            settings_by_user[None] = config.get_active_settings('FREE').copy()
+
+    # Per-trade arithmetic is done once over column arrays; trades without a price get NaN and are skipped below
+    n = len(open_trades)
+    cur = np.fromiter((prices.get(t['coin_symbol'], np.nan) for t in open_trades), dtype=np.float64, count=n)
+    buy = np.fromiter((t['buy_price'] for t in open_trades), dtype=np.float64, count=n)
+    sl = np.fromiter((t['stop_loss_price'] or np.nan for t in open_trades), dtype=np.float64, count=n)
+    tp = np.fromiter((t['take_profit_price'] or np.nan for t in open_trades), dtype=np.float64, count=n)
+    tp_threshold_percent = getattr(config, 'NEAR_TAKE_PROFIT_THRESHOLD_PERCENT', 2)
+    pnl, near_sl, near_tp = scan_trades(buy, sl, tp, cur, float(config.NEAR_STOP_LOSS_THRESHOLD_PERCENT), float(tp_threshold_percent))
+    has_tp = ~np.isnan(tp)
+    # Absolute moves: per unit for the daily P/L tracker, per position for messages (0 without a quantity)
+    price_move = cur - buy
+    qty = np.fromiter((t['quantity'] or 0.0 for t in open_trades), dtype=np.float64, count=n)
+    profit_usdt_all = price_move * qty
+    # Paper trades are sized in USDT rather than quantity
+    paper_size = np.fromiter((t['trade_size_usdt'] or 0.0 for t in open_trades), dtype=np.float64, count=n)
+    paper_profit = price_move * (paper_size / buy)
+    ids = [t['id'] for t in open_trades]
+    # NaN prices and stop-losses compare False, like the NULLs the SQL trigger query used to skip
+    sl_hit = cur <= sl
+    # LIVE trades are checked against Binance for manual sales every cycle
+    synced = np.fromiter((t['mode'] == 'LIVE' for t in open_trades), dtype=bool, count=n)
+
+    # Notifications are collected per user and queued as combined messages after the loop
+    pending_notifications = defaultdict(list)
+    # Closes (and the paper-balance changes they cause) are queued and written in one transaction after the loop
+    to_close = {}
+    paper_credits = {}
+    # Trade ids with an outstanding alert, one set per alert kind, held in a single bot_data entry
+    alerted_sets = _alerted_sets(context)
+    near_sl_alerted = alerted_sets['near_sl']
+    near_tp_alerted = alerted_sets['near_tp']
+    near_sl_before = set(near_sl_alerted)
+    near_sl_alerted &= open_ids
+    near_tp_alerted &= open_ids
+    # Loop-invariant lookups hoisted out of the per-trade loop
+    sync_log_enabled = config.TELEGRAM_SYNC_LOG_ENABLED
+
+    # Only trades with a price this tick and something to act on reach the Python path:
+    # a stop-loss hit, an RSI-exit candidate, a near-SL/TP alert to send or reset, or a mode needing sync
+    alerted_ids = near_sl_alerted | near_tp_alerted
+    alerted = np.fromiter((trade_id in alerted_ids for trade_id in ids), dtype=bool, count=n)
+    visit = ~np.isnan(cur) & (sl_hit | near_sl | near_tp | alerted | synced | (pnl > -1.0))
+    visit_idx = np.flatnonzero(visit)
+    fills = await _fetch_recent_fills(open_trades[i] for i in visit_idx)
+    for i in visit_idx:
+        trade = open_trades[i]
+        mode = trade['mode']
+        buy_ts_ms = trade['buy_ts_ms']
+        user_id = trade['user_id']
+        symbol = trade['coin_symbol']
+        current_price = float(cur[i])
+        pnl_percent = float(pnl[i])
+        settings = settings_by_user[user_id]
         notification = None
         close_reason = None
 
         # --- Risk Management: Update daily P/L after trade close ---
-        if mode == 'LIVE' and buy_ts:
-            user_client = get_user_client(user_id)
-            if user_client:
-                try:
-                    buy_timestamp_dt = datetime.strptime(buy_ts, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
-                    start_time_ms = int(buy_timestamp_dt.timestamp() * 1000)
-                    binance_trades = user_client.get_my_trades(symbol=symbol, startTime=start_time_ms)
-
-                    for binance_trade in binance_trades:
-                        if not binance_trade['isBuyer']:
-                            sell_price = float(binance_trade['price'])
-                            db.close_trade(trade_id=trade['id'], user_id=trade['user_id'],
-                                           sell_price=sell_price, close_reason="Manual Binance Sale")
-                            pnl_percent_manual = ((sell_price - trade['buy_price']) / trade['buy_price']) * 100
-                            notification = (
-                                f"ℹ️ **Manual Sale Detected!** ℹ️\n\n"
-                                f"I see you manually sold your **{symbol}** position on Binance for `${sell_price:,.8f}`.\n\n"
-                                f"   - **P/L:** `{pnl_percent_manual:+.2f}%`\n"
-                                f"   - **Quest ID:** {trade['id']}\n\n"
-                                f"I've updated my records and closed this quest for you. Well done!"
-                            )
-                            close_reason = "Manual"
-                            update_daily_pl(sell_price - trade['buy_price'], db)
-                            break
-                except BinanceAPIException as e:
-                    logger.error(f"Binance API error during trade sync for user {trade['user_id']}: {e}")
-                except Exception as e:
-                    logger.error(f"Unexpected error during trade sync for user {trade['user_id']}: {e}")
-
-        if current_price <= trade['stop_loss_price']:
+        if mode == 'LIVE' and buy_ts_ms:
+            binance_trades = fills.get((user_id, symbol))
+            if binance_trades:
+                for binance_trade in binance_trades:
+                    if not binance_trade['isBuyer'] and binance_trade['time'] >= buy_ts_ms:
+                        sell_price = float(binance_trade['price'])
+                        pnl_percent_manual = ((sell_price - trade['buy_price']) / trade['buy_price']) * 100
+                        manual_win_loss = 'win' if pnl_percent_manual > 0 else ('loss' if pnl_percent_manual < 0 else 'break_even')
+                        to_close.setdefault(trade['id'], (sell_price, "Manual Binance Sale", manual_win_loss, pnl_percent_manual, symbol, trade['id'], trade['user_id']))
+                        notification = (
+                            f"ℹ️ **Manual Sale Detected!** ℹ️\n\n"
+                            f"I see you manually sold your **{symbol}** position on Binance for `${sell_price:,.8f}`.\n\n"
+                            f"   - **P/L:** `{pnl_percent_manual:+.2f}%`\n"
+                            f"   - **Quest ID:** {trade['id']}\n\n"
+                            f"I've updated my records and closed this quest for you. Well done!"
+                        )
+                        close_reason = "Manual"
+                        update_daily_pl(sell_price - trade['buy_price'], db, today)
+                        break
+
+        if sl_hit[i]:
             notification = f"🛡️ **Stop-Loss Triggered!** Your {symbol} quest (ID: {trade['id']}) was closed at `${current_price:,.8f}` (P/L: {pnl_percent:.2f}%)."
             close_reason = "Stop-Loss"
-            db.close_trade(trade_id=trade['id'], user_id=trade['user_id'], sell_price=current_price, close_reason=close_reason, win_loss='loss', pnl_percentage=pnl_percent)
-            update_daily_pl(current_price - trade['buy_price'], db)
+            to_close.setdefault(trade['id'], (current_price, close_reason, 'loss', pnl_percent, symbol, trade['id'], trade['user_id']))
+            update_daily_pl(float(price_move[i]), db, today)
 
         if notification and close_reason == "Manual":
-            try:
-                await context.bot.send_message(chat_id=trade['user_id'], text=notification, parse_mode='Markdown')
-                logger.info(f"Detected and synced manual sale for trade {trade['id']}.")
-            except Exception as e:
-                logger.error(f"Failed to send manual sale notification for trade {trade['id']}: {e}")
+            pending_notifications[trade['user_id']].append((notification, f"manual sale notification for trade {trade['id']}"))
+            logger.info(f"Detected and synced manual sale for trade {trade['id']}.")
             continue
 
         if pnl_percent > -1.0:
             if symbol not in indicator_cache:
                 try:
-                    indicator_cache[symbol] = {'rsi': get_rsi(symbol)}
-                    time.sleep(0.1)
+                    indicator_cache[symbol] = {'rsi': await aget_rsi(symbol)}
                 except BinanceAPIException as e:
                     logger.warning(f"API error getting RSI for {symbol} for RSI exit: {e}")
                 except Exception as e:
@@ -1155,57 +2128,51 @@ async def run_monitoring_cycle(context: ContextTypes.DEFAULT_TYPE, open_trades,
 
             current_rsi = indicator_cache.get(symbol, {}).get('rsi')
 
-            if current_rsi and current_rsi < settings['RSI_SELL_THRESHOLD'] and 'rsi_at_buy' in trade and trade['rsi_at_buy'] > settings['RSI_SELL_THRESHOLD']:
-                profit_usdt = (current_price - trade['buy_price']) * trade['quantity'] if trade['quantity'] else 0.0
+            rsi_sell_threshold = settings['RSI_SELL_THRESHOLD']
+            rsi_at_buy = trade['rsi_at_buy']
+            if current_rsi and current_rsi < rsi_sell_threshold and rsi_at_buy is not None and rsi_at_buy > rsi_sell_threshold:
+                profit_usdt = float(profit_usdt_all[i])
                 notification = (
                     f"📉 **RSI Exit Triggered!** Your {symbol} quest (ID: {trade['id']}) was closed at `${current_price:,.8f}`.\n\n"
                     f"   - **P/L:** `{pnl_percent:.2f}%` (`${profit_usdt:,.2f}` USDT)\n"
                     f"   - Current RSI: `{current_rsi:.2f}`"
                 )
                 close_reason = "RSI Exit"
-                db.close_trade(trade_id=trade['id'], user_id=trade['user_id'], sell_price=current_price, close_reason=close_reason, win_loss='win' if pnl_percent > 0 else 'loss', pnl_percentage=pnl_percent)
-                update_daily_pl(current_price - trade['buy_price'], db)
+                to_close.setdefault(trade['id'], (current_price, close_reason, 'win' if pnl_percent > 0 else 'loss', pnl_percent, symbol, trade['id'], trade['user_id']))
+                update_daily_pl(float(price_move[i]), db, today)
         # Near Stop-Loss alert
-        stop_loss_price = trade.get('stop_loss_price')
-        sl_threshold_price = stop_loss_price * (1 + config.NEAR_STOP_LOSS_THRESHOLD_PERCENT / 100) if stop_loss_price else None
-        near_sl_key = f"near_sl_alert_{trade['id']}"
-        if stop_loss_price and sl_threshold_price and current_price > stop_loss_price and current_price <= sl_threshold_price:
-            if not context.bot_data.get(near_sl_key):
+        stop_loss_price = trade['stop_loss_price']
+        if near_sl[i]:
+            if trade['id'] not in near_sl_alerted:
                 distance_to_sl = ((current_price - stop_loss_price) / stop_loss_price) * 100
                 alert_message = (
                     f"⚠️ **Danger Zone Alert for {symbol}** (ID: {trade['id']}) ⚠️\n\n"
                     f"The price is now just **{distance_to_sl:.2f}%** away from your stop-loss at `${stop_loss_price:,.8f}`.\n\n"
                     f"Consider reviewing your position. You can close this quest with `/close {trade['id']}`."
                 )
-                await context.bot.send_message(chat_id=trade['user_id'], text=alert_message, parse_mode='Markdown')
-                context.bot_data[near_sl_key] = True
-                logger.info(f"Sent 'Near Stop-Loss' alert for trade {trade['id']}")
-        elif context.bot_data.get(near_sl_key):
-            context.bot_data[near_sl_key] = False
+                pending_notifications[trade['user_id']].append((alert_message, f"'Near Stop-Loss' alert for trade {trade['id']}"))
+                near_sl_alerted.add(trade['id'])
+        elif trade['id'] in near_sl_alerted:
+            near_sl_alerted.discard(trade['id'])
             logger.info(f"Reset 'Near Stop-Loss' alert flag for trade {trade['id']} as price moved away from SL.")
 
         # Near Take-Profit alert
-        take_profit_price = trade.get('take_profit_price')
-        tp_threshold_percent = getattr(config, 'NEAR_TAKE_PROFIT_THRESHOLD_PERCENT', 2)
-        tp_threshold_price = take_profit_price * (1 - tp_threshold_percent / 100) if take_profit_price else None
-        near_tp_key = f"near_tp_alert_{trade['id']}"
-        if take_profit_price and tp_threshold_price and current_price >= tp_threshold_price and not context.bot_data.get(near_tp_key):
+        take_profit_price = trade['take_profit_price']
+        if near_tp[i] and trade['id'] not in near_tp_alerted:
             distance_to_tp = ((take_profit_price - current_price) / take_profit_price) * 100
             alert_message = (
                 f"🚀 **Profit Target Approaching for {symbol}** (ID: {trade['id']}) 🚀\n\n"
                 f"The price is now just **{distance_to_tp:.2f}%** away from your take-profit target of `${take_profit_price:,.8f}`.\n\n"
                 f"Current P/L is **{pnl_percent:.2f}%**. Consider if you want to secure profits now with `/close {trade['id']}`."
             )
-            await context.bot.send_message(chat_id=trade['user_id'], text=alert_message, parse_mode='Markdown')
-            context.bot_data[near_tp_key] = True
-            logger.info(f"Sent 'Near Take-Profit' alert for trade {trade['id']}")
-        elif take_profit_price and tp_threshold_price and current_price < tp_threshold_price and context.bot_data.get(near_tp_key):
-            context.bot_data[near_tp_key] = False
+            pending_notifications[trade['user_id']].append((alert_message, f"'Near Take-Profit' alert for trade {trade['id']}"))
+            near_tp_alerted.add(trade['id'])
+        elif has_tp[i] and not near_tp[i] and trade['id'] in near_tp_alerted:
+            near_tp_alerted.discard(trade['id'])
             logger.info(f"Reset 'Near Take-Profit' alert flag for trade {trade['id']}.")
 
         # Trade close logic
-        win_loss = 'win' if pnl_percent > 0 else ('loss' if pnl_percent < 0 else 'break_even')
-        if trade['mode'] == 'LIVE':
+        if mode == 'LIVE':
             if trade['quantity'] and trade['quantity'] > 0:
                 # ...LIVE trade close logic here...
                 # TODO: Implement LIVE trade close logic if needed
@@ -1214,13 +2181,11 @@ async def run_monitoring_cycle(context: ContextTypes.DEFAULT_TYPE, open_trades,
                 # ...LIVE trade fallback logic here...
                 # TODO: Implement LIVE trade fallback logic if needed
                 pass
-        elif trade['mode'] == 'PAPER':
-            success = db.close_trade(trade_id=trade['id'], user_id=trade['user_id'], sell_price=current_price, close_reason=close_reason, win_loss=win_loss, pnl_percentage=pnl_percent)
-            if success:
-                # ...PAPER trade close logic here...
-                # TODO: Implement PAPER trade close logic if needed
-                pass
-        if config.TELEGRAM_SYNC_LOG_ENABLED:
+        elif mode == 'PAPER' and close_reason:
+            # Paper trades only close when an exit fired above, which already queued the close;
+            # the balance is credited with the P/L if that close actually goes through
+            paper_credits[trade['id']] = float(paper_profit[i])
+        if sync_log_enabled:
             # ...telegram sync log logic here...
             # TODO: Implement telegram sync log logic if needed
             pass
@@ -1228,28 +2193,44 @@ async def run_monitoring_cycle(context: ContextTypes.DEFAULT_TYPE, open_trades,
             # ...bollinger bands logic here...
             # TODO: Implement bollinger bands logic if needed
             pass
-
-async def prefetch_prices(open_trades: list) -> dict:
-    """Fetches current prices for all symbols in open trades."""
-    prices = {}
-    symbols_to_fetch = {trade['coin_symbol'] for trade in open_trades}
-    for symbol in symbols_to_fetch:
-        price = get_current_price(symbol)
-        if price:
-            prices[symbol] = price
-        await asyncio.sleep(0.05) # Small delay to avoid hitting rate limits
-    return prices
-
-async def prefetch_indicators(open_trades: list) -> dict:
+        if notification:
+            pending_notifications[trade['user_id']].append((notification, f"{close_reason} notification for trade {trade['id']}"))
+
+    db.close_trades_bulk(list(to_close.values()), paper_credits)
+    for chat_id, notifications in pending_notifications.items():
+        queue_notifications(chat_id, notifications)
+    if near_sl_alerted != near_sl_before:
+        db.set_kv('near_sl_alerted', json.dumps(sorted(near_sl_alerted)))
+
+async def prefetch_prices(symbols: frozenset) -> dict:
+    """Fetches current prices for the open trades' symbols."""
+    if not symbols:
+        return {}
+    # Streamed prices where fresh, the rest in one multi-symbol ticker request
+    return await run_blocking(get_prices, sorted(symbols))
+
+# symbol -> (price, rsi) at the last RSI fetch, used to skip refetching while the price is flat
+_last_rsi_by_symbol = ShadowMap(INDICATOR_STATE_MAX_SYMBOLS)
+RSI_REFETCH_PRICE_MOVE = 0.002
+
+async def prefetch_indicators(open_trades: list, prices: dict) -> dict:
     """Fetches indicators for all symbols in open trades."""
     indicator_cache = {}
-    symbols_to_fetch = {trade['coin_symbol'] for trade in open_trades}
-    for symbol in symbols_to_fetch:
-        # Only fetch RSI for now, as it's used in the exit logic
-        rsi = get_rsi(symbol)
-        if rsi:
-            indicator_cache[symbol] = {'rsi': rsi}
-        await asyncio.sleep(0.05) # Small delay to avoid hitting rate limits
+    # RSI only feeds the RSI-exit check, which the monitor runs for trades above -1% P/L
+    symbols_to_fetch = []
+    for symbol in {trade['coin_symbol'] for trade in open_trades
+                   if trade['coin_symbol'] in prices and prices[trade['coin_symbol']] > trade['buy_price'] * 0.99}:
+        last = _last_rsi_by_symbol.get(symbol)
+        if last and last[1] is not None and abs(prices[symbol] - last[0]) <= last[0] * RSI_REFETCH_PRICE_MOVE:
+            indicator_cache[symbol] = {'rsi': last[1]}
+        else:
+            symbols_to_fetch.append(symbol)
+    # Only fetch RSI for now, as it's used in the exit logic
+    rsis = await asyncio.gather(*(aget_rsi(symbol) for symbol in symbols_to_fetch))
+    # Store misses too, so the trade loop does not refetch RSI once per trade for that symbol
+    for symbol, rsi in zip(symbols_to_fetch, rsis):
+        indicator_cache[symbol] = {'rsi': rsi}
+        _last_rsi_by_symbol[symbol] = (prices[symbol], rsi)
     return indicator_cache
 
 async def scheduled_monitoring_job(context: ContextTypes.DEFAULT_TYPE):
@@ -1264,58 +2245,114 @@ async def scheduled_monitoring_job(context: ContextTypes.DEFAULT_TYPE):
         return
 
     try:
-        # 1. Gather all the data needed
-        open_trades = db.get_open_trades(user_id) # Assuming get_open_trades can take user_id
-        prices = await prefetch_prices(open_trades)
-        indicator_cache = await prefetch_indicators(open_trades)
-
-        # 2. Call your powerful function with all the required data
-        await run_monitoring_cycle(context, open_trades, prices, indicator_cache)
+        async with _monitor_lock:
+            # 1. Gather all the data needed
+            open_trades = db.get_open_trades(user_id) # Assuming get_open_trades can take user_id
+            prices = await prefetch_prices(frozenset(trade['coin_symbol'] for trade in open_trades))
+            _refresh_trade_levels(open_trades, prices)
+            indicator_cache = await prefetch_indicators(open_trades, prices)
+
+            # 2. Call your powerful function with all the required data, alongside the independent BTC check
+            subtasks = {
+                'BTC volatility check': check_btc_volatility_and_alert(context),
+                'monitoring cycle': run_monitoring_cycle(context, open_trades, prices, indicator_cache),
+            }
+            results = await asyncio.gather(*subtasks.values(), return_exceptions=True)
+        for name, result in zip(subtasks, results):
+            if isinstance(result, Exception):
+                logger.error(f"{name} failed in scheduled_monitoring_job: {result}", exc_info=result)
 
     except Exception as e:
         logger.error(f"Error in scheduled_monitoring_job: {e}", exc_info=True)
 
+# Closed-trade signature the adaptive strategy last learned from
+_adaptive_signature = None
+# Adaptive runs never overlap, even if the scheduler's max_instances is overridden
+_adaptive_lock = asyncio.Lock()
+
+# APScheduler options for the periodic jobs: a run that is still going makes the next one
+# skip rather than stack up, and runs missed while the loop was busy collapse into one
+# that may start up to 30s late instead of being dropped
+SINGLE_INSTANCE_JOB = {'coalesce': True, 'max_instances': 1, 'misfire_grace_time': 30}
+
+def _query_adaptive_parameters(last_signature):
+    """
+    The closed-trade signature with the learned (RSI threshold, top coins), or with None if
+    the signature is unchanged since `last_signature`. Blocking SQLite reads; what is learned
+    is also saved to the kv table so a restart picks it up without re-learning.
+    """
+    # The learned values only change when trades are closed, so an unchanged history is skipped
+    signature = db.get_closed_trades_signature()
+    if signature == last_signature:
+        return signature, None
+    # Both aggregates run in SQLite, so no per-trade rows are materialized
+    best_coins = db.get_top_coins_by_avg_pnl(5)
+    if not best_coins:
+        return signature, (None, best_coins)
+    median_rsi = db.get_profitable_rsi_median()
+    rsi_threshold = int(median_rsi) if median_rsi is not None else None
+    # One kv row, so the threshold, coins and signature are always saved together
+    db.set_kv('adaptive_learned', json.dumps({'signature': signature, 'rsi_threshold': rsi_threshold, 'top_coins': best_coins}))
+    return signature, (rsi_threshold, best_coins)
+
+def _apply_adaptive_parameters(rsi_threshold, best_coins):
+    if rsi_threshold is not None:
+        config.LAST_LEARNED_RSI_THRESHOLD = rsi_threshold
+    config.ADAPTIVE_TOP_COINS = best_coins
+
+def restore_adaptive_parameters():
+    """Loads the last learned adaptive parameters from the kv table into config after a restart."""
+    global _adaptive_signature
+    stored = db.get_kv('adaptive_learned')
+    if not stored:
+        return
+    learned = json.loads(stored)
+    _apply_adaptive_parameters(learned['rsi_threshold'], learned['top_coins'])
+    # The next adaptive run skips learning unless trades were closed in the meantime
+    _adaptive_signature = tuple(learned['signature'])
+    logger.info(f"Adaptive strategy: Restored RSI threshold {learned['rsi_threshold']} and top coins {learned['top_coins']}")
+
 async def adaptive_strategy_job():
     """Periodically analyze trade history and adapt strategy parameters."""
+    if _adaptive_lock.locked():
+        logger.info("Adaptive strategy job skipped: the previous run is still in progress.")
+        return
+    async with _adaptive_lock:
+        await _run_adaptive_strategy()
+
+async def _run_adaptive_strategy():
+    global _adaptive_signature
     logger.info("Running adaptive strategy job...")
-    conn = db.get_db_connection()
-    cursor = conn.execute("SELECT rsi_at_buy, pnl_percentage, coin_symbol FROM trades WHERE status = 'closed' AND rsi_at_buy IS NOT NULL AND pnl_percentage IS NOT NULL")
-    rows = cursor.fetchall()
-    if not rows:
+    # The queries run in a worker thread (with its own db connection) so the event loop keeps serving
+    signature, learned = await asyncio.to_thread(_query_adaptive_parameters, _adaptive_signature)
+    if learned is None:
+        logger.info("Adaptive strategy: No trades closed since the last run; keeping learned parameters.")
+        return
+    _adaptive_signature = signature
+    rsi_threshold, best_coins = learned
+    if not best_coins:
         logger.info("No closed trades with RSI and PnL data for learning.")
         return
-    # Analyze RSI thresholds
-    profitable_rsi = [row['rsi_at_buy'] for row in rows if row['pnl_percentage'] > 0]
-    if profitable_rsi:
-        new_rsi_threshold = int(statistics.median(profitable_rsi))
-        config.LAST_LEARNED_RSI_THRESHOLD = new_rsi_threshold
-        logger.info(f"Adaptive strategy: Updated RSI buy threshold to {new_rsi_threshold}")
-    # Analyze best coins
-    coin_pnl = {}
-    for row in rows:
-        coin = row['coin_symbol']
-        coin_pnl.setdefault(coin, []).append(row['pnl_percentage'])
-    avg_coin_pnl = {c: statistics.mean(pnls) for c, pnls in coin_pnl.items() if pnls}
-    best_coins = sorted(avg_coin_pnl, key=avg_coin_pnl.get, reverse=True)[:5]
-    config.ADAPTIVE_TOP_COINS = best_coins
+    _apply_adaptive_parameters(rsi_threshold, best_coins)
+    if rsi_threshold is not None:
+        logger.info(f"Adaptive strategy: Updated RSI buy threshold to {rsi_threshold}")
     logger.info(f"Adaptive strategy: Top performing coins: {best_coins}")
     # Optionally, adjust allocation or other parameters here
     # ...existing code...
 
-# Schedule the adaptive strategy job (example: every 6 hours)
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-
-# Scheduler setup
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-scheduler = AsyncIOScheduler()
-scheduler.add_job(adaptive_strategy_job, 'interval', hours=6)
+@lru_cache(maxsize=1)
+def get_scheduler():
+    """
+    The scheduler running the adaptive strategy job every 6 hours, built on first use so
+    importing this module doesn't construct one (and every caller shares the same instance).
+    """
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(adaptive_strategy_job, 'interval', hours=6, **SINGLE_INSTANCE_JOB)
+    return scheduler
 
 def start_scheduler():
-    scheduler.start()
+    get_scheduler().start()
 
-from telegram import Update
-from telegram.ext import CommandHandler, ContextTypes
-from modules import db_access as db
 
 async def usercount_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     conn = db.get_db_connection()
@@ -1,7 +1,10 @@
 # trading_module.py
 
+from bisect import bisect_right
 from enum import Enum
 
+import numpy as np
+
 class TradeAction(Enum):
     """Defines possible trading actions."""
     HOLD = "HOLD"
@@ -10,17 +13,25 @@ class TradeAction(Enum):
     CONSERVATIVE_SELL = "CONSERVATIVE_SELL"
     AGGRESSIVE_SELL = "AGGRESSIVE_SELL"
 
+# Upper bounds of the resonance bands, each band's action at the same position
+_RESONANCE_THRESHOLDS = (0.8, 1.2, 1.8)
+_RESONANCE_ACTIONS = (TradeAction.CONSERVATIVE_SELL, TradeAction.HOLD, TradeAction.CONSERVATIVE_BUY, TradeAction.AGGRESSIVE_BUY)
+
 def get_trade_suggestion(resonance_level: float) -> TradeAction:
     """
     Generates a trading suggestion based on the resonance level.
     This is a simplified example. A real implementation would incorporate
     this resonance level into a more complex trading algorithm.
     """
-    if resonance_level < 0.8:
-        return TradeAction.CONSERVATIVE_SELL
-    elif resonance_level < 1.2:
-        return TradeAction.HOLD
-    elif resonance_level < 1.8:
-        return TradeAction.CONSERVATIVE_BUY
-    else:
-        return TradeAction.AGGRESSIVE_BUY
\ No newline at end of file
+    return _RESONANCE_ACTIONS[bisect_right(_RESONANCE_THRESHOLDS, resonance_level)]
+
+def get_trade_suggestion_codes(resonance_levels) -> np.ndarray:
+    """
+    Band index of each resonance level as an int8 array, in one searchsorted call.
+    `_RESONANCE_ACTIONS[code]` is the TradeAction, so callers only build enums when logging or persisting.
+    """
+    return np.searchsorted(_RESONANCE_THRESHOLDS, resonance_levels, side='right').astype(np.int8)
+
+def get_trade_suggestion_batch(resonance_levels) -> np.ndarray:
+    """get_trade_suggestion for an array of resonance levels, as an object array of TradeActions."""
+    return np.array(_RESONANCE_ACTIONS, dtype=object)[get_trade_suggestion_codes(resonance_levels)]